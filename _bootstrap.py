@@ -0,0 +1,21 @@
+"""
+Shared entrypoint bootstrap.
+
+Patches the Python path once and memoizes the FastAPI app so every entrypoint
+(Vercel's app.py, deploy.py) reuses the same imported ``src.api.main`` module.
+"""
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+
+@lru_cache(maxsize=1)
+def get_app():
+    """Import and return the FastAPI app, initializing it at most once."""
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    from src.api.main import app
+
+    return app
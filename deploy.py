@@ -11,15 +11,26 @@ import os
 import sys
 import logging
 import asyncio
+import hashlib
+import time
+from importlib.metadata import distributions
+from importlib.util import find_spec
 from pathlib import Path
 
 # Add src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from core.production_config import validate_production_environment, production_settings
-from api.main import app
+from core.production_config import (
+    REQUIRED_PRODUCTION_VARS,
+    validate_production_environment,
+    production_settings,
+)
 import uvicorn
 
+def default_workers():
+    """Gunicorn-style 2n+1 worker count, capped at 8"""
+    return min(2 * (os.cpu_count() or 1) + 1, 8)
+
 def setup_logging():
     """Setup production logging configuration"""
     from core.production_config import get_logging_config
@@ -59,9 +70,11 @@ def setup_directories():
         Path("./logs")
     ]
     
-    for directory in directories:
-        Path(directory).mkdir(parents=True, exist_ok=True)
-        print(f"✅ Created directory: {directory}")
+    # Dedupe (several entries can resolve to the same path) and create parents first
+    unique_dirs = sorted({Path(d).resolve() for d in directories}, key=lambda p: len(p.parts))
+    for directory in unique_dirs:
+        directory.mkdir(parents=True, exist_ok=True)
+    print(f"✅ Ensured {len(unique_dirs)} directories: {', '.join(str(d) for d in unique_dirs)}")
 
 def validate_environment():
     """Validate production environment before starting"""
@@ -74,52 +87,66 @@ def validate_environment():
     
     print("✅ Production environment validated successfully")
 
-def check_dependencies():
+# Per-probe timeout (seconds) for the parallel preflight checks
+PREFLIGHT_TIMEOUT = 5
+
+# Import names (not distribution names) of the packages the server needs
+REQUIRED_PACKAGES = [
+    "fastapi",
+    "uvicorn",
+    "langchain",
+    "langchain_ollama",
+    "langgraph",
+    "pydantic",
+    "dotenv"
+]
+
+def _find_missing_packages():
+    """Return required packages that cannot be located (found without importing them)"""
+    return [package for package in REQUIRED_PACKAGES if find_spec(package) is None]
+
+async def check_dependencies():
     """Check if all required dependencies are available"""
-    required_packages = [
-        "fastapi",
-        "uvicorn",
-        "langchain",
-        "langchain_ollama",
-        "langgraph",
-        "pydantic",
-        "python-dotenv"
-    ]
-    
-    missing_packages = []
+    if preflight_is_cached():
+        # Nothing the check depends on changed since it last passed
+        print("✅ Dependencies unchanged since last check")
+        return True
     
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing_packages.append(package)
+    missing_packages = _find_missing_packages()
     
     if missing_packages:
         print(f"❌ Missing required packages: {', '.join(missing_packages)}")
         print("Please install missing packages with: pip install " + " ".join(missing_packages))
-        sys.exit(1)
+        return False
     
     print("✅ All required dependencies are available")
+    store_preflight_cache()
+    return True
 
-def check_services():
-    """Check if external services are available"""
-    from core.production_config import get_llm_config, get_search_config
-    
-    llm_config = get_llm_config()
-    
-    # Check Ollama service
+_HTTP_CLIENT = None
+
+def _http_client():
+    """Return the keep-alive HTTP client shared by the service probes"""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None:
+        import httpx
+        _HTTP_CLIENT = httpx.Client(timeout=PREFLIGHT_TIMEOUT)
+    return _HTTP_CLIENT
+
+def _check_ollama(base_url):
+    """Probe the Ollama HTTP API"""
     try:
-        import requests
-        response = requests.get(f"{llm_config['base_url']}/api/tags", timeout=5)
+        response = _http_client().get(f"{base_url}/api/tags")
         if response.status_code == 200:
-            print(f"✅ Ollama service is running at {llm_config['base_url']}")
+            print(f"✅ Ollama service is running at {base_url}")
         else:
-            print(f"⚠️  Ollama service may not be running at {llm_config['base_url']}")
+            print(f"⚠️  Ollama service may not be running at {base_url}")
             print("Please ensure Ollama is running: ollama serve")
     except Exception as e:
         print(f"⚠️  Cannot check Ollama service: {str(e)}")
-    
-    # Check database connectivity
+
+def _check_database():
+    """Run a trivial query against the configured database"""
     try:
         from database.connection import get_db_connection
         conn = get_db_connection()
@@ -128,9 +155,79 @@ def check_services():
     except Exception as e:
         print(f"❌ Database connection failed: {str(e)}")
 
-def create_startup_banner():
-    """Create startup banner with production information"""
-    banner = """
+async def _run_probe(name, func, *args):
+    """Run a blocking probe in a worker thread, bounded by PREFLIGHT_TIMEOUT"""
+    try:
+        await asyncio.wait_for(asyncio.to_thread(func, *args), timeout=PREFLIGHT_TIMEOUT)
+    except asyncio.TimeoutError:
+        print(f"⚠️  {name} check timed out after {PREFLIGHT_TIMEOUT}s")
+
+async def check_services():
+    """Check if external services are available"""
+    from core.production_config import get_llm_config
+    
+    llm_config = get_llm_config()
+    
+    # Ollama and the database are probed concurrently
+    await asyncio.gather(
+        _run_probe("Ollama", _check_ollama, llm_config["base_url"]),
+        _run_probe("Database", _check_database),
+    )
+
+PROJECT_ROOT = Path(__file__).parent
+PREFLIGHT_CACHE = PROJECT_ROOT / "data" / ".preflight_cache"
+PREFLIGHT_CACHE_TTL = 24 * 60 * 60  # Re-check dependencies at least once a day
+
+def _preflight_fingerprint():
+    """Hash the inputs the dependency check depends on
+    
+    Covers the interpreter, requirements.txt, every installed distribution
+    and version (so an added, removed or upgraded package invalidates it),
+    and the validated settings wherever they come from (.env, Docker or
+    k8s environment). Only the digest is stored, never the values.
+    """
+    parts = [sys.version.encode()]
+    
+    requirements_path = PROJECT_ROOT / "requirements.txt"
+    if requirements_path.exists():
+        parts.append(hashlib.blake2b(requirements_path.read_bytes()).digest())
+    
+    installed = sorted(f"{dist.metadata['Name']}=={dist.version}" for dist in distributions())
+    parts.append("\n".join(installed).encode())
+    
+    for var in REQUIRED_PRODUCTION_VARS:
+        value = str(getattr(production_settings, var, None) or "")
+        parts.append(hashlib.blake2b(f"{var}={value}".encode()).digest())
+    
+    return hashlib.blake2b(b"".join(parts)).hexdigest().encode()
+
+def preflight_is_cached():
+    """Return True if a fresh dependency-check cache entry matches the current fingerprint"""
+    try:
+        if time.time() - PREFLIGHT_CACHE.stat().st_mtime > PREFLIGHT_CACHE_TTL:
+            return False
+        return PREFLIGHT_CACHE.read_bytes() == _preflight_fingerprint()
+    except OSError:
+        return False
+
+def store_preflight_cache():
+    """Record the current fingerprint after a successful dependency check"""
+    try:
+        PREFLIGHT_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        PREFLIGHT_CACHE.write_bytes(_preflight_fingerprint())
+    except OSError as e:
+        print(f"⚠️  Could not write preflight cache: {str(e)}")
+
+async def _preflight():
+    """Run dependency checks, service probes and directory setup concurrently"""
+    dependencies_ok, _, _ = await asyncio.gather(
+        check_dependencies(),
+        check_services(),
+        asyncio.to_thread(setup_directories),
+    )
+    return dependencies_ok
+
+_BANNER = """
 ╔══════════════════════════════════════════════════════════╗
 ║                                                              ║
 ║           🚀 EMAIL ASSISTANT PRODUCTION SERVER              ║
@@ -141,29 +238,27 @@ def create_startup_banner():
 ║  API: http://{host}:{port}                             ║
 ║                                                              ║
 ╚══════════════════════════════════════════════════════════╝
-    """.format(
-        model=production_settings.PRIMARY_LLM,
-        host=production_settings.API_HOST,
-        port=production_settings.API_PORT
-    )
-    
-    print(banner)
+    """
+
+def create_startup_banner():
+    """Create startup banner with production information"""
+    print(_BANNER.format_map({
+        "model": production_settings.PRIMARY_LLM,
+        "host": production_settings.API_HOST,
+        "port": production_settings.API_PORT
+    }))
 
 def main():
     """Main deployment function"""
     print("🚀 Starting Email Assistant Production Deployment...")
     
-    # Validate environment
+    # Validate environment (cheap, so it runs on every start)
     validate_environment()
     
-    # Check dependencies
-    check_dependencies()
-    
-    # Check external services
-    check_services()
-    
-    # Setup directories
-    setup_directories()
+    # Check dependencies (cached), probe external services and create
+    # directories in parallel
+    if not asyncio.run(_preflight()):
+        sys.exit(1)
     
     # Setup logging
     setup_logging()
@@ -175,16 +270,25 @@ def main():
     from core.production_config import get_api_config
     api_config = get_api_config()
     
+    # Worker processes inherit this, and size their IMAP session pools from it
+    workers = api_config.get("workers") or default_workers()
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    
     # Start production server
     print(f"🌐 Starting production server on {api_config['host']}:{api_config['port']}")
     
     try:
         uvicorn.run(
-            app=app,
+            # Import string + factory so each worker process builds its own app
+            "_bootstrap:get_app",
+            factory=True,
             host=api_config["host"],
             port=api_config["port"],
-            workers=api_config["workers"],
+            workers=workers,
             reload=api_config["reload"],
+            # "auto" picks uvloop and httptools when installed, else asyncio/h11
+            loop="auto",
+            http="auto",
             log_level="info",
             access_log=True,
             use_colors=False
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Test the Email Assistant app with real sender and recipient emails.
-Uses the /draft and /process API endpoints.
+Uses the /draft and /process API endpoints, which are exercised concurrently
+over a single pooled HTTP client.
 
 Usage:
     python scripts/test_real_emails.py SENDER_EMAIL RECIPIENT_EMAIL
@@ -13,9 +14,16 @@ Or set via env:
     SENDER_EMAIL=john@gmail.com RECIPIENT_EMAIL=jane@outlook.com python scripts/test_real_emails.py
 """
 
+import asyncio
+import json
 import os
 import sys
-import requests
+import httpx
+
+try:
+    import orjson
+except ImportError:  # orjson ships with langgraph; fall back to stdlib json otherwise
+    orjson = None
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -39,16 +47,9 @@ Best regards""",
 }
 
 
-def test_draft(sender: str, recipient: str) -> dict:
-    """Test the /api/v1/email/draft endpoint."""
-    print("\n" + "=" * 60)
-    print("1. TESTING DRAFT ENDPOINT")
-    print("=" * 60)
-    print(f"From: {sender}")
-    print(f"To: {recipient}")
-    print(f"Subject: {SAMPLE_EMAIL['subject'][:50]}...")
-
-    payload = {
+def build_payload(sender: str, recipient: str) -> dict:
+    """Request body shared by the /draft and /process endpoints."""
+    return {
         "subject": SAMPLE_EMAIL["subject"],
         "body": SAMPLE_EMAIL["body"],
         "from_email": sender,
@@ -56,78 +57,98 @@ def test_draft(sender: str, recipient: str) -> dict:
         "cc_emails": [],
     }
 
-    try:
-        resp = requests.post(
-            f"{API_BASE}/api/v1/email/draft",
-            json=payload,
-            timeout=90,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        print("\n✅ Draft generated successfully!")
-        print("\n--- AI Draft Response ---")
-        print(data.get("draft", "(no draft)"))
-        print("\n--- Suggested Subject ---")
-        print(data.get("suggested_subject", "N/A"))
-        print("\n--- Tone Analysis ---")
-        print(data.get("tone_analysis", "N/A"))
-        return data
-    except requests.exceptions.RequestException as e:
-        print(f"\n❌ Draft request failed: {e}")
-        if hasattr(e, "response") and e.response is not None:
-            print(f"   Status: {e.response.status_code}")
-            print(f"   Body: {e.response.text[:500]}")
-        raise
 
+def encode_payload(payload: dict) -> bytes:
+    """Serialize a request body once so it can be reused across requests."""
+    return orjson.dumps(payload) if orjson else json.dumps(payload).encode()
 
-def test_process(sender: str, recipient: str) -> dict:
-    """Test the /api/v1/email/process endpoint."""
-    print("\n" + "=" * 60)
-    print("2. TESTING PROCESS ENDPOINT")
-    print("=" * 60)
-    print(f"From: {sender}")
-    print(f"To: {recipient}")
-
-    payload = {
-        "subject": SAMPLE_EMAIL["subject"],
-        "body": SAMPLE_EMAIL["body"],
-        "from_email": sender,
-        "to_emails": [recipient],
-        "cc_emails": [],
-    }
 
+async def post_json(client: httpx.AsyncClient, path: str, body: bytes, label: str) -> dict:
+    """POST a pre-encoded JSON body and return the decoded JSON response."""
     try:
-        resp = requests.post(
-            f"{API_BASE}/api/v1/email/process",
-            json=payload,
-            timeout=90,
-        )
+        resp = await client.post(path, content=body)
         resp.raise_for_status()
-        data = resp.json()
-        print("\n✅ Email processed successfully!")
-        print(f"\nSuccess: {data.get('success')}")
-        print("\n--- AI Response ---")
-        print(data.get("draft", "(no draft)"))
-        print("\n--- Actions Taken ---")
-        print(data.get("actions", []))
-        return data
-    except requests.exceptions.RequestException as e:
-        print(f"\n❌ Process request failed: {e}")
-        if hasattr(e, "response") and e.response is not None:
-            print(f"   Status: {e.response.status_code}")
-            print(f"   Body: {e.response.text[:500]}")
+        return orjson.loads(resp.content) if orjson else resp.json()
+    except httpx.HTTPError as e:
+        print(f"\n❌ {label} request failed: {e}")
+        response = getattr(e, "response", None)
+        if response is not None:
+            print(f"   Status: {response.status_code}")
+            print(f"   Body: {response.text[:500]}")
         raise
 
 
-def check_health() -> bool:
+def report_draft(sender: str, recipient: str, data: dict) -> None:
+    """Print the result of the /api/v1/email/draft endpoint."""
+    lines = [
+        "",
+        "=" * 60,
+        "1. TESTING DRAFT ENDPOINT",
+        "=" * 60,
+        f"From: {sender}",
+        f"To: {recipient}",
+        f"Subject: {SAMPLE_EMAIL['subject'][:50]}...",
+        "\n✅ Draft generated successfully!",
+        "\n--- AI Draft Response ---",
+        str(data.get("draft", "(no draft)")),
+        "\n--- Suggested Subject ---",
+        str(data.get("suggested_subject", "N/A")),
+        "\n--- Tone Analysis ---",
+        str(data.get("tone_analysis", "N/A")),
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def report_process(sender: str, recipient: str, data: dict) -> None:
+    """Print the result of the /api/v1/email/process endpoint."""
+    lines = [
+        "",
+        "=" * 60,
+        "2. TESTING PROCESS ENDPOINT",
+        "=" * 60,
+        f"From: {sender}",
+        f"To: {recipient}",
+        "\n✅ Email processed successfully!",
+        f"\nSuccess: {data.get('success')}",
+        "\n--- AI Response ---",
+        str(data.get("draft", "(no draft)")),
+        "\n--- Actions Taken ---",
+        str(data.get("actions", [])),
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+async def check_health(client: httpx.AsyncClient) -> bool:
     """Verify the API is running."""
     try:
-        resp = requests.get(f"{API_BASE}/health", timeout=5)
+        resp = await client.get("/health", timeout=5)
         return resp.status_code == 200
     except Exception:
         return False
 
 
+async def run_tests(sender: str, recipient: str) -> bool:
+    """Check health, then hit /draft and /process concurrently on one connection pool."""
+    limits = httpx.Limits(max_keepalive_connections=8)
+    headers = {"Content-Type": "application/json"}
+    async with httpx.AsyncClient(
+        base_url=API_BASE, timeout=90, limits=limits, headers=headers
+    ) as client:
+        if not await check_health(client):
+            return False
+        print("\n✅ Backend is running")
+
+        body = encode_payload(build_payload(sender, recipient))
+        draft, processed = await asyncio.gather(
+            post_json(client, "/api/v1/email/draft", body, "Draft"),
+            post_json(client, "/api/v1/email/process", body, "Process"),
+        )
+
+    report_draft(sender, recipient, draft)
+    report_process(sender, recipient, processed)
+    return True
+
+
 def main():
     sender = os.environ.get("SENDER_EMAIL")
     recipient = os.environ.get("RECIPIENT_EMAIL")
@@ -149,14 +170,10 @@ def main():
     print(f"Sender: {sender}")
     print(f"Recipient: {recipient}")
 
-    if not check_health():
+    if not asyncio.run(run_tests(sender, recipient)):
         print(f"\n❌ Backend not reachable at {API_BASE}")
         print("   Start the backend first: uvicorn src.api.main:app --reload")
         sys.exit(1)
-    print("\n✅ Backend is running")
-
-    test_draft(sender, recipient)
-    test_process(sender, recipient)
     print("\n" + "=" * 60)
     print("All tests passed!")
     print("=" * 60)
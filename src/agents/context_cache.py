@@ -0,0 +1,62 @@
+"""
+TTL cache for context lookups in the Email Assistant.
+
+Retries, replays and near-identical emails re-issue the same knowledge-base
+and web searches. Results are cached per tool and argument set for a short
+time so those repeats skip the round trip. Each entry has its own TTL, so
+slow-changing sources (web search) can be kept longer than fast-changing ones.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+def cache_key(tool_name: str, args: Dict[str, Any]) -> bytes:
+    """Return a compact digest identifying a tool call."""
+    payload = json.dumps(args, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.blake2b(f"{tool_name}\x00{payload}".encode(), digest_size=16).digest()
+
+
+class TTLCache:
+    """Thread-safe bounded LRU whose entries expire after a per-entry TTL."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a copy of the live value for ``key``, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` for ``ttl`` seconds (the cache default when omitted)."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,17 +1,27 @@
-from typing import TypedDict, Annotated, List, Optional, Dict, Any
-from langgraph.graph import StateGraph, END
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_groq import ChatGroq
+from typing import TYPE_CHECKING, AsyncIterator, Annotated, List, Literal, Optional, Dict, Any
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from importlib.util import find_spec
+import asyncio
+import hashlib
+import json
 import operator
+import threading
+import uuid
 from datetime import datetime
-from dotenv import load_dotenv
+from anyio import CapacityLimiter, to_thread
 from loguru import logger
+from pydantic import BaseModel, Field
 
-load_dotenv()
+try:
+    import orjson
+except ImportError:  # orjson ships with langgraph; fall back to stdlib json otherwise
+    orjson = None
 
 from src.guardrails.content_guard import ContentGuard, RiskLevel
 from src.hitl.review_manager import ReviewManager
+from src.agents.response_cache import ResponseCache
+from src.agents.context_cache import TTLCache, cache_key
 from src.core.config import settings
 
 
@@ -21,26 +31,356 @@ from src.agents.tools import (
     SearchTools,
     CalendarTools,
     FileTools,
+    bind_tool,
+    get_calendar_tools,
+    get_search_tools,
 )
 
+# Stateless tool objects invoked directly by the graph nodes. Search and
+# calendar tools are methods on process-wide instances; the agent binds them.
+send_email = EmailTools.send_email
+send_emails_batch = EmailTools.send_emails_batch
+draft_email = EmailTools.draft_email
+get_unread_emails = EmailTools.get_unread_emails
+search_emails = EmailTools.search_emails
+read_attachment = FileTools.read_attachment
+save_draft = FileTools.save_draft
+
+if TYPE_CHECKING:
+    from langchain_groq import ChatGroq
+
+# LangChain / LangGraph / Groq are imported inside the methods that need them so
+# that importing this module stays cheap (serverless cold starts, test collection).
+_DOTENV_LOADED = False
+
+# Only the most recent turns are replayed into the response prompt.
+_MAX_HISTORY = 8
+
+
+def _load_env_once() -> None:
+    """Load .env on first agent construction instead of at import time."""
+    global _DOTENV_LOADED
+    if not _DOTENV_LOADED:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _DOTENV_LOADED = True
+
+
+# Exact replays (retries, duplicate webhooks, CI runs) of an identical rendered
+# prompt are answered from this many cached generations instead of the API.
+_LLM_CACHE_SIZE = 256
+_LLM_MAX_RETRIES = 3
+_LLM_TIMEOUT = 60.0
+# Keep-alive pool shared by every request to the Groq API
+_LLM_MAX_KEEPALIVE = 50
+_LLM_MAX_CONNECTIONS = 100
+
+
+@lru_cache(maxsize=1)
+def _shared_llm() -> "ChatGroq":
+    """Return the process-wide ChatGroq client shared by every agent instance."""
+    import httpx
+    from langchain_core.caches import InMemoryCache
+    from langchain_groq import ChatGroq
+
+    # Multiplex concurrent completions over HTTP/2 when the optional h2 extra
+    # (httpx[http2]) is installed; otherwise pool HTTP/1.1 keep-alive sockets.
+    http2 = find_spec("h2") is not None
+    limits = httpx.Limits(
+        max_keepalive_connections=_LLM_MAX_KEEPALIVE,
+        max_connections=_LLM_MAX_CONNECTIONS,
+    )
+
+    return ChatGroq(
+        model="llama-3.1-8b-instant",
+        temperature=0.1,
+        streaming=True,
+        cache=InMemoryCache(maxsize=_LLM_CACHE_SIZE),
+        # The Groq SDK retries connection errors, 429s and 5xx with jittered
+        # exponential backoff on its pooled client, so transient failures are
+        # absorbed without rebuilding the client; a hung call no longer pins
+        # a worker indefinitely.
+        max_retries=_LLM_MAX_RETRIES,
+        request_timeout=_LLM_TIMEOUT,
+        http_client=httpx.Client(http2=http2, limits=limits, follow_redirects=True),
+        http_async_client=httpx.AsyncClient(http2=http2, limits=limits, follow_redirects=True),
+    )
+
+
+async def close_shared_llm() -> None:
+    """Close the shared ChatGroq HTTP connection pools, if the client was built."""
+    if not _shared_llm.cache_info().currsize:
+        return
+    llm = _shared_llm()
+    # langchain_groq keeps the Groq SDK clients behind its completions resources
+    sync_client = getattr(llm.client, "_client", None)
+    async_client = getattr(llm.async_client, "_client", None)
+    if sync_client is not None:
+        sync_client.close()
+    if async_client is not None:
+        await async_client.close()
+    _shared_llm.cache_clear()
+
+
+# Attachment text kept per file; readers stop extracting once they have this much
+ATTACHMENT_PREVIEW_CHARS = 500
+
+# Longest string any single tool result may contribute to the response prompt
+MAX_TOOL_RESULT_CHARS = 800
+
+# Keys already sent to the model through another prompt variable
+_PROMPT_EXCLUDED_CONTEXT = frozenset({"draft_prompt"})
+
+
+def _is_error_only(value: Any) -> bool:
+    if isinstance(value, dict):
+        return set(value) == {"error"}
+    if isinstance(value, list):
+        return bool(value) and all(_is_error_only(item) for item in value)
+    return False
+
+
+def _truncate(value: Any) -> Any:
+    """Clip every string in a tool result to MAX_TOOL_RESULT_CHARS."""
+    if isinstance(value, str):
+        return value if len(value) <= MAX_TOOL_RESULT_CHARS else value[:MAX_TOOL_RESULT_CHARS] + "…"
+    if isinstance(value, dict):
+        return {k: _truncate(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_truncate(v) for v in value]
+    return value
+
+
+def _compact_context(context: Dict[str, Any], analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the context worth paying input tokens for.
+
+    Drops empty results and failed tool calls, clips long strings, and leaves
+    out unread inbox emails unless the analysis asked for inbox context.
+    """
+    wants_inbox = "inbox" in analysis["context_needed"]
+
+    compact = {}
+    for key, value in context.items():
+        if key in _PROMPT_EXCLUDED_CONTEXT or value in (None, "", [], {}):
+            continue
+        if _is_error_only(value):
+            continue
+        if key == "unread_emails" and not wants_inbox:
+            continue
+        compact[key] = _truncate(value)
+    return compact
+
+
+def _serialize_context(context: Dict[str, Any]) -> str:
+    """Render gathered context as compact, key-sorted JSON for the response prompt."""
+    if orjson is not None:
+        return orjson.dumps(
+            context, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+        ).decode()
+    return json.dumps(context, default=str, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+
+
+# Cap on concurrent blocking tool calls (IMAP, SMTP, HTTP search, file reads).
+# Kept below Starlette's default threadpool (40 tokens) so slow tools cannot
+# starve sync endpoints and dependencies that share the same worker threads.
+_TOOL_THREAD_LIMIT = 16
+
+
+@lru_cache(maxsize=1)
+def _tool_limiter() -> CapacityLimiter:
+    """Return the process-wide limiter for tool calls offloaded to threads."""
+    return CapacityLimiter(_TOOL_THREAD_LIMIT)
+
+
+# Search results reused across retries, replays and repeated emails. Web
+# results change slowly, so they are kept longer than knowledge-base hits.
+_CONTEXT_CACHE = TTLCache(
+    maxsize=getattr(settings, "CONTEXT_CACHE_SIZE", 1024),
+    ttl=getattr(settings, "CONTEXT_CACHE_TTL", 300),
+)
+_CACHED_TOOL_TTLS = {
+    "internal_knowledge_search": getattr(settings, "CONTEXT_CACHE_TTL", 300),
+    "web_search": getattr(settings, "WEB_SEARCH_CACHE_TTL", 3600),
+}
+
+
+def clear_context_cache() -> None:
+    """Drop all cached search results (e.g. between tests)."""
+    _CONTEXT_CACHE.clear()
+
+
+async def _run_tool(tool: Any, args: Dict[str, Any]) -> Any:
+    """Invoke a synchronous tool in a worker thread, off the event loop."""
+    return await to_thread.run_sync(tool.invoke, args, limiter=_tool_limiter())
+
+
+_DRAFT_KEY_POINTS = (
+    "Acknowledge the email",
+    "Address the main request or question",
+    "Provide clear next steps if needed",
+)
+
+
+async def _run_cached_tool(tool: Any, args: Dict[str, Any]) -> Any:
+    """Like ``_run_tool``, serving repeat search calls from the context cache."""
+    ttl = _CACHED_TOOL_TTLS.get(tool.name)
+    if ttl is None or not getattr(settings, "CONTEXT_CACHE_ENABLED", True):
+        return await _run_tool(tool, args)
+
+    key = cache_key(tool.name, args)
+    cached = _CONTEXT_CACHE.get(key)
+    if cached is not None:
+        return cached
+    result = await _run_tool(tool, args)
+    if not _is_error_only(result):
+        _CONTEXT_CACHE.set(key, result, ttl)
+    return result
+
+
 # State definition
-class AgentState(TypedDict):
-    messages: Annotated[List, operator.add]
-    email_data: Dict[str, Any]
-    context: Dict[str, Any]
-    next_step: str
-    metadata: Dict[str, Any]
+# Prompt text shared by every agent instance. System prompts must stay static
+# (no timestamps or per-email data) so each request starts with a byte-identical
+# prefix that providers with automatic prefix caching (Groq, OpenAI) can reuse;
+# everything that varies per email goes in the trailing human message.
+ANALYSIS_SYSTEM_PROMPT = """You are an expert email analyst. Analyze the email to determine:
+1. Intent (question, request, complaint, scheduling, acknowledgement, etc.)
+2. Urgency (low, medium, high, critical)
+3. Required actions (leave empty when a reply is enough)
+4. Context needed for response (leave empty when the email alone is enough)
+5. Suggested response type
+Answer only through the EmailAnalysis tool."""
+
+ANALYSIS_HUMAN_TEMPLATE = "Analyze this email:\n\nSubject: {subject}\n\nBody: {body}"
+
+RESPONSE_SYSTEM_PROMPT = (
+    "You are a professional email assistant. "
+    "Write a clear, concise, and appropriate response. "
+    "Write a response that addresses all points in the original email."
+)
+
+RESPONSE_HUMAN_TEMPLATE = """Original Email:
+Subject: {subject}
+From: {from_email}
+Body: {body}
+
+Gathered context (search, calendar, attachments, etc.): {context_json}
+
+{draft_guidance}"""
+
+
+class EmailAnalysis(BaseModel):
+    """Structured analysis of an incoming email, used for routing."""
+    intent: Literal[
+        "question", "request", "complaint", "scheduling", "information", "acknowledgement", "other"
+    ]
+    urgency: Literal["low", "medium", "high", "critical"]
+    required_actions: List[Literal["schedule_meeting", "confirm", "book", "send"]] = Field(
+        default_factory=list,
+        description="Actions to carry out before replying; empty if a reply is enough",
+    )
+    context_needed: List[Literal["external_facts", "calendar", "inbox", "internal_docs"]] = Field(
+        default_factory=list,
+        description="Sources to consult before replying; empty if the email alone is enough",
+    )
+    response_type: str = Field(
+        default="professional",
+        description="Suggested response type or tone, e.g. 'professional', 'apology'",
+    )
+
+
+# Used when the model fails to return a parseable analysis: reply, take no actions
+_FALLBACK_ANALYSIS = EmailAnalysis(intent="other", urgency="medium")
+
+
+def _analysis_flags(analysis: EmailAnalysis) -> Dict[str, bool]:
+    """Routing decisions derived once from the analysis and read by later nodes."""
+    return {
+        "execute": bool(analysis.required_actions),
+        "research": "external_facts" in analysis.context_needed,
+        # Looking up free slots is read-only, so any hint of scheduling is enough
+        "availability": (
+            analysis.intent == "scheduling"
+            or "schedule_meeting" in analysis.required_actions
+            or "calendar" in analysis.context_needed
+        ),
+        # Booking creates a real event with invites: only when explicitly asked for
+        "meeting": "schedule_meeting" in analysis.required_actions,
+    }
+
+
+def _merge_context(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """Reducer letting parallel context-gathering branches each add their own keys."""
+    return {**left, **right}
+
+
+@dataclass(slots=True)
+class ActionRecord:
+    """Outcome of one tool call made on the email's behalf."""
+    tool: str
+    result: Any = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.error is not None:
+            return {"tool": self.tool, "error": self.error}
+        return {"tool": self.tool, "result": self.result}
+
+
+@dataclass(slots=True)
+class EmailMetadata:
+    """Per-run results written by the graph nodes.
+
+    Every field has a default, so nodes read them without presence checks;
+    ``analysis`` always carries the full EmailAnalysis shape.
+    """
+    analysis: Dict[str, Any] = field(default_factory=_FALLBACK_ANALYSIS.model_dump)
+    flags: Dict[str, bool] = field(default_factory=lambda: _analysis_flags(_FALLBACK_ANALYSIS))
+    draft_response: Optional[str] = None
+    actions: List[ActionRecord] = field(default_factory=list)
+    review_id: Optional[str] = None
+    confidence_score: float = 1.0
+    # One clock reading per run so availability and scheduling agree on "now"
+    started_at: datetime = field(default_factory=datetime.now)
+
+
+def _merge_metadata(left: EmailMetadata, right: Any) -> EmailMetadata:
+    """Reducer: nodes return only the fields they set; merged as a shallow copy.
+
+    ``actions`` is append-only: a node returns just the records it produced and
+    they are concatenated onto the run's list.
+    """
+    if isinstance(right, EmailMetadata):
+        return right
+    if "actions" in right:
+        right = {**right, "actions": left.actions + list(right["actions"])}
+    return replace(left, **right)
+
+
+@dataclass(slots=True)
+class AgentState:
+    """Graph state. Nodes read attributes and return partial updates as dicts."""
+    email_data: Dict[str, Any] = field(default_factory=dict)
+    search_query: str = ""  # subject + body, built once per run for the lookups
+    messages: Annotated[List, operator.add] = field(default_factory=list)
+    context: Annotated[Dict[str, Any], _merge_context] = field(default_factory=dict)
+    next_step: str = "analyze"
+    metadata: Annotated[EmailMetadata, _merge_metadata] = field(default_factory=EmailMetadata)
     # Guardrail & HITL fields
-    guardrail_result: Optional[Dict[str, Any]]   # Output of ContentGuard.check()
-    requires_human_review: bool                   # True when HITL is needed
-    review_status: Optional[str]                  # pending / approved / rejected
-    review_id: Optional[str]                      # ID in hitl_reviews table
+    guardrail_result: Optional[Dict[str, Any]] = None   # Output of ContentGuard.check()
+    requires_human_review: bool = False                 # True when HITL is needed
+    review_status: Optional[str] = None                 # pending / approved / rejected
+    review_id: Optional[str] = None                     # ID in hitl_reviews table
 
 class EmailAssistantAgent:
+
     def __init__(self, config: Dict[str, Any] = None):
+        _load_env_once()
         self.config = config or {}
         self.llm = self._initialize_llm()
+        self._analyze_chain, self._response_chain = self._build_chains()
         self.tools = self._initialize_tools()
+        self._tool = {t.name: t for t in self.tools}
         self.guard = ContentGuard(
             confidence_threshold=getattr(settings, "GUARDRAIL_CONFIDENCE_THRESHOLD", 0.6),
             max_draft_length=getattr(settings, "GUARDRAIL_MAX_DRAFT_LENGTH", 5000),
@@ -54,307 +394,419 @@ class EmailAssistantAgent:
                 "sqlite:///", ""
             )
         )
+        self.response_cache = ResponseCache(
+            threshold=getattr(settings, "RESPONSE_CACHE_THRESHOLD", 0.93),
+            max_entries=getattr(settings, "RESPONSE_CACHE_SIZE", 512),
+            fuzzy=getattr(settings, "RESPONSE_CACHE_FUZZY", False),
+        ) if getattr(settings, "RESPONSE_CACHE_ENABLED", True) else None
+        # Write-behind queue for save/send side effects; bound to a running loop lazily
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
         self.agent = self._build_agent_graph()
+        # Draft-only variant without the action nodes (see process_email(fast=True))
+        self.fast_agent = self._build_agent_graph(with_actions=False)
         
     def _initialize_llm(self):
-        return ChatGroq(
-            model="llama-3.1-8b-instant",
-            temperature=0.1,
-            streaming=True
-        )
+        return _shared_llm()
     
+    def _build_chains(self):
+        """Build the analysis and response prompt chains once per agent."""
+        from langchain_core.messages import SystemMessage
+        from langchain_core.prompts import (
+            ChatPromptTemplate,
+            HumanMessagePromptTemplate,
+            MessagesPlaceholder,
+        )
+
+        analyze_prompt = ChatPromptTemplate.from_messages([
+            SystemMessage(content=ANALYSIS_SYSTEM_PROMPT),
+            HumanMessagePromptTemplate.from_template(ANALYSIS_HUMAN_TEMPLATE),
+        ])
+
+        response_prompt = ChatPromptTemplate.from_messages([
+            SystemMessage(content=RESPONSE_SYSTEM_PROMPT),
+            MessagesPlaceholder(variable_name="chat_history"),
+            HumanMessagePromptTemplate.from_template(RESPONSE_HUMAN_TEMPLATE),
+        ])
+
+        # The analysis is structured output, so run it deterministically; that
+        # also makes exact replays hit the LLM cache.
+        analyze_llm = self.llm.with_structured_output(EmailAnalysis, temperature=0)
+        return analyze_prompt | analyze_llm, response_prompt | self.llm
+
     def _initialize_tools(self):
+        search_tools, calendar_tools = get_search_tools(), get_calendar_tools()
         return [
-            EmailTools.send_email,
-            EmailTools.draft_email,
-            EmailTools.get_unread_emails,
-            EmailTools.search_emails,
-            SearchTools.web_search,
-            SearchTools.internal_knowledge_search,
-            CalendarTools.check_availability,
-            CalendarTools.schedule_meeting,
-            FileTools.read_attachment,
-            FileTools.save_draft,
+            send_email,
+            send_emails_batch,
+            draft_email,
+            get_unread_emails,
+            search_emails,
+            bind_tool(SearchTools.web_search, search_tools),
+            bind_tool(SearchTools.web_search_many, search_tools),
+            bind_tool(SearchTools.internal_knowledge_search, search_tools),
+            bind_tool(CalendarTools.check_availability, calendar_tools),
+            bind_tool(CalendarTools.schedule_meeting, calendar_tools),
+            read_attachment,
+            save_draft,
         ]
     
-    def _build_agent_graph(self):
-        """Build the LangGraph workflow with guardrail and HITL nodes."""
+    def _build_agent_graph(self, with_actions: bool = True):
+        """Build the LangGraph workflow with guardrail and HITL nodes.
+
+        With ``with_actions=False`` the action nodes and their routing are left
+        out and gather_context feeds generate_response directly; lookups,
+        guardrails and the review gate are unchanged.
+        """
+        from langgraph.graph import StateGraph, START, END
+
         workflow = StateGraph(AgentState)
 
         # Core nodes
         workflow.add_node("analyze_email", self._analyze_email)
-        workflow.add_node("gather_context", self._gather_context)
+        workflow.add_node("gather_context_static", self._gather_static_context)
+        workflow.add_node("gather_context_conditional", self._gather_conditional_context)
+        workflow.add_node("gather_context", self._join_context)
         workflow.add_node("generate_response", self._generate_response)
-        workflow.add_node("execute_actions", self._execute_actions)
-        workflow.add_node("review_and_finalize", self._review_and_finalize)
+        if with_actions:
+            workflow.add_node("calendar_action", self._calendar_action)
+            workflow.add_node("prepare_draft", self._prepare_draft)
 
         # Safety nodes (new)
         workflow.add_node("guardrail_check", self._guardrail_check)
         workflow.add_node("human_review_gate", self._human_review_gate)
 
-        # Entry point
-        workflow.set_entry_point("analyze_email")
+        # Entry: the analysis LLM call and the analysis-independent lookups
+        # (knowledge base, inbox, attachments) start together
+        workflow.add_edge(START, "analyze_email")
+        workflow.add_edge(START, "gather_context_static")
 
-        # analyze → gather_context
-        workflow.add_edge("analyze_email", "gather_context")
+        # analyze → lookups that depend on the analysis (web search, calendar)
+        workflow.add_edge("analyze_email", "gather_context_conditional")
 
-        # gather_context → execute_actions OR generate_response
-        workflow.add_conditional_edges(
-            "gather_context",
-            self._should_execute_actions,
-            {
-                "execute": "execute_actions",
-                "respond": "generate_response",
-            },
-        )
+        # Both branches join at gather_context
+        workflow.add_edge(["gather_context_static", "gather_context_conditional"], "gather_context")
 
-        # execute_actions → generate_response
-        workflow.add_edge("execute_actions", "generate_response")
+        # gather_context fans out to the action nodes that apply (they run in
+        # the same step and join at generate_response), or straight to
+        # generate_response when there is nothing to execute
+        if with_actions:
+            workflow.add_conditional_edges(
+                "gather_context",
+                self._route_actions,
+                ["calendar_action", "prepare_draft", "generate_response"],
+            )
+            workflow.add_edge("calendar_action", "generate_response")
+            workflow.add_edge("prepare_draft", "generate_response")
+        else:
+            workflow.add_edge("gather_context", "generate_response")
 
         # generate_response → guardrail_check → human_review_gate
         workflow.add_edge("generate_response", "guardrail_check")
         workflow.add_edge("guardrail_check", "human_review_gate")
 
-        # human_review_gate → review_and_finalize OR END (awaiting review)
-        workflow.add_conditional_edges(
-            "human_review_gate",
-            self._should_proceed_after_review,
-            {
-                "proceed": "review_and_finalize",
-                "halt": END,
-            },
-        )
-
-        workflow.add_edge("review_and_finalize", END)
+        # human_review_gate finalizes (queues save/send) or halts awaiting review
+        workflow.add_edge("human_review_gate", END)
 
-        return workflow.compile()
+        # By default each email is a single stateless run: no checkpointer, so
+        # LangGraph never serializes AgentState between nodes. HITL resumes go
+        # through ReviewManager rather than a persisted graph thread. With
+        # GRAPH_CHECKPOINT_ENABLED a failed run can be retried from its last
+        # completed node instead of re-running the analysis LLM call.
+        checkpointer = None
+        if getattr(settings, "GRAPH_CHECKPOINT_ENABLED", False):
+            from langgraph.checkpoint.memory import InMemorySaver
+            from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+            checkpointer = InMemorySaver(serde=JsonPlusSerializer(
+                allowed_msgpack_modules=[(__name__, "EmailMetadata"), (__name__, "ActionRecord")],
+            ))
+        return workflow.compile(checkpointer=checkpointer, debug=False)
     
-    def _analyze_email(self, state: AgentState) -> AgentState:
+    def _analyze_email(self, state: AgentState) -> Dict[str, Any]:
         """Analyze incoming email to determine intent and priority"""
-        messages = state["messages"]
-        email_data = state["email_data"]
-        
-        system_prompt = """You are an expert email analyst. Analyze the email to determine:
-        1. Intent (question, request, complaint, scheduling, etc.)
-        2. Urgency (low, medium, high, critical)
-        3. Required actions
-        4. Context needed for response
-        5. Suggested response type"""
-        
-        analysis_prompt = ChatPromptTemplate.from_messages([
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=f"Analyze this email:\n\nSubject: {email_data.get('subject')}\n\nBody: {email_data.get('body')}")
-        ])
-        
-        chain = analysis_prompt | self.llm
-        analysis = chain.invoke({})
-        
-        state["metadata"]["analysis"] = analysis.content
-        state["next_step"] = "gather_context"
-        
-        return state
-    
-    def _gather_context(self, state: AgentState) -> AgentState:
-        """Gather additional context using all relevant tools."""
-        email_data = state["email_data"]
-        query = (email_data.get("subject", "") + " " + email_data.get("body", "")).strip() or "email context"
-        analysis = state["metadata"].get("analysis", "").lower()
+        email_data = state.email_data
 
-        # 1. Internal knowledge search
         try:
-            state["context"]["search_results"] = internal_knowledge_search.invoke({
-                "query": query,
-                "max_results": 5,
+            analysis = self._analyze_chain.invoke({
+                "subject": email_data.get("subject"),
+                "body": email_data.get("body"),
             })
         except Exception as e:
-            state["context"]["search_results"] = [{"error": str(e)}]
-
-        # 2. Web search (when we need external info)
-        if self._needs_external_info(state):
-            try:
-                state["context"]["web_search"] = web_search.invoke({
-                    "query": query,
-                    "max_results": 5,
-                })
-            except Exception as e:
-                state["context"]["web_search"] = [{"error": str(e)}]
+            logger.warning(f"Structured email analysis failed, using fallback: {e}")
+            analysis = None
+        if analysis is None:
+            analysis = _FALLBACK_ANALYSIS
+        
+        return {
+            "metadata": {"analysis": analysis.model_dump(), "flags": _analysis_flags(analysis)},
+            "next_step": "gather_context",
+        }
+    
+    @staticmethod
+    def _context_query(email_data: Dict[str, Any]) -> str:
+        return (email_data.get("subject", "") + " " + email_data.get("body", "")).strip() or "email context"
 
-        # 3. Calendar availability (if meeting/scheduling mentioned)
-        if "meeting" in analysis or "schedule" in analysis:
-            try:
-                state["context"]["availability"] = check_availability.invoke({
-                    "duration": 60,
-                    "date": datetime.now().strftime("%Y-%m-%d"),
-                })
-            except Exception as e:
-                state["context"]["availability"] = [{"error": str(e)}]
+    async def _gather_static_context(self, state: AgentState) -> Dict[str, Any]:
+        """Gather context that does not depend on the analysis, concurrently with it."""
+        email_data = state.email_data
+        query = state.search_query or self._context_query(email_data)
 
-        # 4. Unread emails (inbox context)
-        try:
-            state["context"]["unread_emails"] = get_unread_emails.invoke({
+        # None of these calls depends on another, so they all run at once and
+        # the node takes as long as the slowest tool rather than their sum.
+        calls = {
+            # 1. Internal knowledge search
+            "search_results": _run_cached_tool(self._tool["internal_knowledge_search"], {
+                "query": query,
+                "max_results": 5,
+            }),
+            # 4. Unread emails (inbox context)
+            "unread_emails": _run_tool(get_unread_emails, {
                 "limit": 5,
                 "folder": "inbox",
-            })
-        except Exception as e:
-            state["context"]["unread_emails"] = []
-
-        # 5. Search emails
-        try:
-            state["context"]["email_search"] = search_emails.invoke({
+            }),
+            # 5. Search emails
+            "email_search": _run_tool(search_emails, {
                 "query": query,
                 "limit": 5,
-            })
-        except Exception as e:
-            state["context"]["email_search"] = []
+            }),
+        }
 
         # 6. Read attachments if paths provided
         attachments = email_data.get("attachments") or []
+        paths = []
         if isinstance(attachments, list):
-            attachment_contents = []
             for att in attachments:
                 path = att.get("path") or att.get("file_path") if isinstance(att, dict) else att
                 if isinstance(path, str):
-                    try:
-                        content = read_attachment.invoke({"file_path": path})
-                        attachment_contents.append({"path": path, "content_preview": (content or "")[:500]})
-                    except Exception as e:
-                        attachment_contents.append({"path": path, "error": str(e)})
-            if attachment_contents:
-                state["context"]["attachment_contents"] = attachment_contents
-
-        return state
+                    paths.append(path)
+
+        results = await asyncio.gather(
+            *calls.values(),
+            *(
+                _run_tool(read_attachment, {"file_path": path, "max_chars": ATTACHMENT_PREVIEW_CHARS})
+                for path in paths
+            ),
+            return_exceptions=True,
+        )
+
+        context = self._collect_results(calls, results)
+
+        attachment_contents = []
+        for path, result in zip(paths, results[len(calls):]):
+            if isinstance(result, Exception):
+                attachment_contents.append({"path": path, "error": str(result)})
+            else:
+                attachment_contents.append({"path": path, "content_preview": (result or "")[:ATTACHMENT_PREVIEW_CHARS]})
+        if attachment_contents:
+            context["attachment_contents"] = attachment_contents
+
+        return {"context": context}
+
+    async def _gather_conditional_context(self, state: AgentState) -> Dict[str, Any]:
+        """Gather context whose need is decided by the analysis."""
+        analysis = state.metadata.analysis
+        if analysis["intent"] == "acknowledgement" or (
+            analysis["urgency"] == "low" and not analysis["required_actions"]
+        ):
+            # Thank-yous and FYIs are answered from the email body alone
+            return {}
+
+        query = state.search_query or self._context_query(state.email_data)
+        calls = {}
+        # 2. Web search (when we need external info)
+        if self._needs_external_info(state):
+            calls["web_search"] = _run_cached_tool(self._tool["web_search"], {
+                "query": query,
+                "max_results": 5,
+            })
+        # 3. Calendar availability (if meeting/scheduling mentioned)
+        if self._wants_availability(state):
+            calls["availability"] = _run_tool(self._tool["check_availability"], {
+                "duration": 60,
+                "date": state.metadata.started_at.strftime("%Y-%m-%d"),
+            })
+
+        if not calls:
+            return {}
+        results = await asyncio.gather(*calls.values(), return_exceptions=True)
+        return {"context": self._collect_results(calls, results)}
+
+    @staticmethod
+    def _collect_results(calls: Dict[str, Any], results: List[Any]) -> Dict[str, Any]:
+        """Map gathered tool results back to their context keys."""
+        context = {}
+        for key, result in zip(calls, results):
+            if isinstance(result, Exception):
+                # Inbox lookups degrade to "nothing found"; the rest record the error
+                result = [] if key in ("unread_emails", "email_search") else [{"error": str(result)}]
+            context[key] = result
+        return context
+
+    def _join_context(self, state: AgentState) -> Dict[str, Any]:
+        """Join point for the context branches; routing happens on its outgoing edge."""
+        return {}
     
-    def _generate_response(self, state: AgentState) -> AgentState:
-        """Generate email response using gathered context (including tool outputs)."""
-        messages = state["messages"]
-        email_data = state["email_data"]
-        context = state["context"]
+    async def _generate_response(self, state: AgentState) -> Dict[str, Any]:
+        """Generate email response using gathered context (including tool outputs).
+
+        Awaited on the event loop so the streaming ChatGroq client's tokens reach
+        ``process_email_stream`` as they arrive rather than via a worker thread.
+        """
+        messages = state.messages[-_MAX_HISTORY:]
+        email_data = state.email_data
+        context = state.context
         draft_guidance = context.get("draft_prompt") or ""
 
-        response_prompt = ChatPromptTemplate.from_messages([
-            SystemMessage(content="You are a professional email assistant. Write a clear, concise, and appropriate response."),
-            MessagesPlaceholder(variable_name="chat_history"),
-            HumanMessage(content=f"""
-            Original Email:
-            Subject: {email_data.get('subject')}
-            From: {email_data.get('from_email', email_data.get('from', ''))}
-            Body: {email_data.get('body')}
+        response = await self._response_chain.ainvoke({
+            "chat_history": messages,
+            "subject": email_data.get("subject"),
+            "from_email": email_data.get("from_email", email_data.get("from", "")),
+            "body": email_data.get("body"),
+            "context_json": _serialize_context(
+                _compact_context(context, state.metadata.analysis)
+            ),
+            "draft_guidance": f"Draft guidance from preparation: {draft_guidance}" if draft_guidance else "",
+        })
 
-            Gathered context (search, calendar, attachments, etc.): {context}
+        return {"metadata": {"draft_response": response.content}}
+    
+    async def _calendar_action(self, state: AgentState) -> Dict[str, Any]:
+        """Schedule the meeting the analysis asked for.
 
-            {f"Draft guidance from preparation: {draft_guidance}" if draft_guidance else ""}
+        The action record is also dispatched as an ``action`` custom event so
+        ``process_email_stream`` can show it before the reply is drafted.
+        """
+        from langchain_core.callbacks import adispatch_custom_event
 
-            Write a response that addresses all points in the original email.
-            """)
-        ])
+        email_data = state.email_data
+        started_at = state.metadata.started_at
+        to_emails = email_data.get("to_emails") or ["recipient@example.com"]
+        recipient = to_emails[0] if to_emails else "recipient@example.com"
 
-        chain = response_prompt | self.llm
-        response = chain.invoke({"chat_history": messages})
+        try:
+            record = ActionRecord("schedule_meeting", result=await _run_tool(self._tool["schedule_meeting"], {
+                "attendees": to_emails if isinstance(to_emails, list) else [recipient],
+                "subject": email_data.get("subject", "Meeting"),
+                "duration": 60,
+                "preferred_time": started_at.strftime("%H:00"),
+                "date": started_at.strftime("%Y-%m-%d"),
+            }))
+        except Exception as e:
+            record = ActionRecord("schedule_meeting", error=str(e))
 
-        state["metadata"]["draft_response"] = response.content
-        return state
-    
-    def _execute_actions(self, state: AgentState) -> AgentState:
-        """Execute required actions using tools: schedule_meeting, draft_email."""
-        email_data = state["email_data"]
-        analysis = state["metadata"].get("analysis", "") or ""
-        actions_taken = state["metadata"].get("actions", []) or []
-
-        # Schedule meeting if analysis suggests it
-        if any(kw in analysis.lower() for kw in ["schedule", "meeting", "book", "calendar"]):
-            try:
-                to_emails = email_data.get("to_emails") or ["recipient@example.com"]
-                recipient = to_emails[0] if to_emails else "recipient@example.com"
-                schedule_result = schedule_meeting.invoke({
-                    "attendees": to_emails if isinstance(to_emails, list) else [recipient],
-                    "subject": email_data.get("subject", "Meeting"),
-                    "duration": 60,
-                    "preferred_times": [datetime.now().strftime("%Y-%m-%dT%H:00")],
-                })
-                actions_taken.append({"tool": "schedule_meeting", "result": schedule_result})
-            except Exception as e:
-                actions_taken.append({"tool": "schedule_meeting", "error": str(e)})
+        await adispatch_custom_event("action", record.to_dict())
+        return {"metadata": {"actions": [record]}}
 
-        # Draft email (key points from analysis) for later use in generate_response
+    def _prepare_draft(self, state: AgentState) -> Dict[str, Any]:
+        """Draft email (key points from analysis) for later use in generate_response."""
+        email_data = state.email_data
+        to_emails = email_data.get("to_emails") or ["recipient@example.com"]
+        recipient = to_emails[0] if to_emails else "recipient@example.com"
         try:
-            to_emails = email_data.get("to_emails") or ["recipient@example.com"]
-            recipient = to_emails[0] if to_emails else "recipient@example.com"
-            key_points = [
-                "Acknowledge the email",
-                "Address the main request or question",
-                "Provide clear next steps if needed",
-            ]
-            draft_prompt = draft_email.invoke({
-                "recipient": recipient,
-                "subject": email_data.get("subject", "Reply"),
-                "key_points": key_points,
-                "tone": "professional",
-            })
-            state["context"]["draft_prompt"] = draft_prompt
+            # Pure string formatting, so call the tool's function directly and
+            # skip the tool-call machinery (validation, callbacks, worker thread)
+            draft_prompt = draft_email.func(
+                recipient=recipient,
+                subject=email_data.get("subject", "Reply"),
+                key_points=list(_DRAFT_KEY_POINTS),
+                tone="professional",
+            )
         except Exception as e:
-            state["context"]["draft_prompt"] = f"Draft preparation note: {e}"
+            draft_prompt = f"Draft preparation note: {e}"
+        return {"context": {"draft_prompt": draft_prompt}}
 
-        state["metadata"]["actions"] = actions_taken
-        return state
-    
-    def _review_and_finalize(self, state: AgentState) -> AgentState:
-        """Review and finalize; save draft via save_draft; optionally send via send_email."""
-        email_data = state["email_data"]
-        draft = state["metadata"].get("draft_response") or ""
-        actions_taken = state["metadata"].get("actions", []) or []
+    async def _finalize(self, state: AgentState) -> List[ActionRecord]:
+        """Queue save_draft and, optionally, send_email for an approved draft.
+
+        The draft save is a write whose result the caller does not need, so it
+        is handed to the background writer and recorded as a queued action.
+        A send is awaited, so the caller sees whether it went out.
+        """
+        email_data = state.email_data
+        draft = state.metadata.draft_response or ""
+        if not draft.strip():
+            return []
+        get = email_data.get
 
         # Save draft using save_draft tool
-        if draft.strip():
-            try:
-                save_result = save_draft.invoke({
-                    "content": draft,
-                    "metadata": {
-                        "subject": email_data.get("subject"),
-                        "to_emails": email_data.get("to_emails"),
-                        "from_email": email_data.get("from_email"),
-                    },
-                })
-                actions_taken.append({"tool": "save_draft", "result": save_result})
-            except Exception as e:
-                actions_taken.append({"tool": "save_draft", "error": str(e)})
+        actions_taken = [self._enqueue_write("save_draft", save_draft, {
+            "content": draft,
+            "metadata": {
+                "subject": get("subject"),
+                "to_emails": get("to_emails"),
+                "from_email": get("from_email"),
+            },
+        })]
 
         # Optionally send email when request has auto_send (e.g. from API/UI)
-        if email_data.get("auto_send") and draft.strip():
-            to_list = email_data.get("to_emails") or []
-            if to_list and email_data.get("from_email"):
+        if get("auto_send"):
+            to_list = get("to_emails") or []
+            if to_list and get("from_email"):
                 try:
-                    send_result = send_email.invoke({
+                    send_result = await _run_tool(send_email, {
                         "to": to_list if isinstance(to_list, list) else [to_list],
-                        "subject": email_data.get("subject", "Reply"),
+                        "subject": get("subject", "Reply"),
                         "body": draft,
-                        "cc": email_data.get("cc_emails") or None,
+                        "cc": get("cc_emails") or None,
                     })
-                    actions_taken.append({"tool": "send_email", "result": send_result})
+                    actions_taken.append(ActionRecord("send_email", result=send_result))
                 except Exception as e:
-                    actions_taken.append({"tool": "send_email", "error": str(e)})
+                    actions_taken.append(ActionRecord("send_email", error=str(e)))
+
+        return actions_taken
 
-        state["metadata"]["actions"] = actions_taken
-        return state
+    def _enqueue_write(self, name: str, tool: Any, args: Dict[str, Any]) -> ActionRecord:
+        """Queue a side-effecting tool call for the background writer."""
+        loop = asyncio.get_running_loop()
+        if self._writer_task is None or self._writer_task.done() or self._writer_task.get_loop() is not loop:
+            self._write_queue = asyncio.Queue()
+            self._writer_task = loop.create_task(self._writer(self._write_queue))
+        trace_id = uuid.uuid4().hex
+        self._write_queue.put_nowait((trace_id, name, tool, args))
+        return ActionRecord(name, result={"status": "queued", "trace_id": trace_id})
+
+    @staticmethod
+    async def _writer(queue: asyncio.Queue) -> None:
+        """Drain queued writes one at a time, logging each outcome against its trace id."""
+        while True:
+            trace_id, name, tool, args = await queue.get()
+            try:
+                result = await _run_tool(tool, args)
+                logger.info(f"{name} completed (trace_id={trace_id}): {result}")
+            except Exception as e:
+                logger.error(f"{name} failed (trace_id={trace_id}): {e}")
+            finally:
+                queue.task_done()
+
+    async def drain_writes(self, timeout: float = 30.0) -> None:
+        """Wait for queued writes to finish (e.g. on shutdown), then stop the writer."""
+        if self._writer_task is None or self._writer_task.get_loop() is not asyncio.get_running_loop():
+            return
+        try:
+            await asyncio.wait_for(self._write_queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{self._write_queue.qsize()} queued writes dropped at shutdown")
+        self._writer_task.cancel()
+        self._writer_task = None
     
-    def _guardrail_check(self, state: AgentState) -> AgentState:
+    def _guardrail_check(self, state: AgentState) -> Dict[str, Any]:
         """Run ContentGuard on the generated draft and annotate state."""
-        draft = state["metadata"].get("draft_response", "")
-        confidence = float(state["metadata"].get("confidence_score", 1.0))
+        draft = state.metadata.draft_response or ""
+        confidence = float(state.metadata.confidence_score)
 
         result = self.guard.check(
             draft=draft,
             confidence_score=confidence,
-            original_email=state.get("email_data"),
+            original_email=state.email_data,
         )
 
-        state["guardrail_result"] = {
+        guardrail_result = {
             "passed": result.passed,
             "violations": result.violations,
             "risk_level": result.risk_level.value,
             "requires_human_review": result.requires_human_review,
             "details": result.details,
         }
-        state["requires_human_review"] = result.requires_human_review
 
         if result.violations:
             logger.warning(
@@ -364,78 +816,70 @@ class EmailAssistantAgent:
         else:
             logger.info("Guardrail check passed — no violations.")
 
-        return state
+        return {
+            "guardrail_result": guardrail_result,
+            "requires_human_review": result.requires_human_review,
+        }
 
-    def _human_review_gate(self, state: AgentState) -> AgentState:
-        """If review is required, create a review record and halt execution."""
-        if not state.get("requires_human_review"):
-            # All clear — no review needed.
-            state["review_status"] = None
-            state["review_id"] = None
-            return state
+    async def _human_review_gate(self, state: AgentState) -> Dict[str, Any]:
+        """Finalize a cleared draft, or create a review record and halt execution."""
+        if not state.requires_human_review:
+            # All clear — save (and send) here rather than in a separate node
+            return {
+                "review_status": None,
+                "review_id": None,
+                "metadata": {"actions": await self._finalize(state)},
+            }
 
-        draft = state["metadata"].get("draft_response", "")
-        gr = state.get("guardrail_result", {})
+        draft = state.metadata.draft_response or ""
+        gr = state.guardrail_result
 
-        review_id = self.review_manager.create_review(
-            email_data=state["email_data"],
+        review_id = await to_thread.run_sync(lambda: self.review_manager.create_review(
+            email_data=state.email_data,
             draft=draft,
             violations=gr.get("violations", []),
             risk_level=gr.get("risk_level", "medium"),
-        )
-
-        state["review_id"] = review_id
-        state["review_status"] = "pending"
-        state["metadata"]["review_id"] = review_id
+        ))
 
         logger.info(
             f"Email draft queued for human review (review_id={review_id}, "
             f"risk={gr.get('risk_level')})"
         )
-        return state
-
-    def _should_proceed_after_review(self, state: AgentState) -> str:
-        """Routing: proceed to finalize if no human review needed, else halt."""
-        if state.get("requires_human_review"):
-            return "halt"
-        return "proceed"
-
-    def _should_execute_actions(self, state: AgentState) -> str:
-        """Determine if actions need to be executed before responding."""
-        analysis = state["metadata"].get("analysis", "")
-        if any(action in analysis.lower() for action in ["schedule", "confirm", "book", "send"]):
-            return "execute"
-        return "respond"
+        return {
+            "review_id": review_id,
+            "review_status": "pending",
+            "metadata": {"review_id": review_id},
+        }
+
+    def _route_actions(self, state: AgentState) -> List[str]:
+        """Pick the action nodes to run before responding (all in parallel)."""
+        flags = state.metadata.flags
+        if not flags["execute"]:
+            return ["generate_response"]
+        return ["calendar_action", "prepare_draft"] if self._wants_meeting(state) else ["prepare_draft"]
     
     def _needs_external_info(self, state: AgentState) -> bool:
         """Check if external information is needed"""
-        analysis = state["metadata"].get("analysis", "")
-        # Simple heuristic - can be enhanced
-        question_words = ["what", "when", "where", "who", "why", "how", "?"]
-        return any(word in analysis.lower() for word in question_words)
-    
-    async def process_email(self, email_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Main entry point for processing an email."""
-        initial_state: AgentState = {
-            "messages": [],
-            "email_data": email_data,
-            "context": {},
-            "next_step": "analyze",
-            "metadata": {},
-            # Guardrail / HITL defaults
-            "guardrail_result": None,
-            "requires_human_review": False,
-            "review_status": None,
-            "review_id": None,
-        }
+        return state.metadata.flags["research"]
 
-        # Execute the agent graph
-        result = await self.agent.ainvoke(initial_state)
+    def _wants_availability(self, state: AgentState) -> bool:
+        """Check if calendar availability is relevant to the reply"""
+        return state.metadata.flags["availability"]
+
+    def _wants_meeting(self, state: AgentState) -> bool:
+        """Check if the email asks for a meeting to be scheduled"""
+        return state.metadata.flags["meeting"]
+    
+    def _initial_state(self, email_data: Dict[str, Any]) -> AgentState:
+        """Build the graph input for a single email; every other field starts at its default."""
+        return AgentState(email_data=email_data, search_query=self._context_query(email_data))
 
+    def _format_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape the final graph values (a dict of AgentState fields) into the public result."""
         return {
-            "response": result["metadata"].get("draft_response"),
-            "actions_taken": result["metadata"].get("actions", []),
-            "analysis": result["metadata"].get("analysis"),
+            "response": result["metadata"].draft_response,
+            "actions_taken": [action.to_dict() for action in result["metadata"].actions],
+            "analysis": result["metadata"].analysis,
             "context_used": result["context"],
             # Guardrail / HITL metadata
             "guardrail_result": result.get("guardrail_result"),
@@ -444,6 +888,183 @@ class EmailAssistantAgent:
             "review_status": result.get("review_status"),
         }
 
+    async def process_email(self, email_data: Dict[str, Any], fast: bool = False) -> Dict[str, Any]:
+        """Main entry point for processing an email.
+
+        ``fast=True`` runs the draft-only graph: the same analysis, lookups,
+        guardrails and review gate, but no actions (e.g. meeting scheduling)
+        and no conditional routing before the response.
+        """
+        cacheable = self._is_cacheable(email_data)
+        if cacheable:
+            cached = self.response_cache.get(email_data)
+            if cached is not None:
+                logger.info("Duplicate email — reusing cached response")
+                return await self._replay_cached(email_data, cached)
+
+        # Execute the agent graph
+        result = self._format_result(await self._run_graph(self.fast_agent if fast else self.agent, email_data))
+
+        # Only replies that needed no actions are reusable: a hit skips the
+        # action nodes. Draft-only runs never executed them, so they must not
+        # answer full runs either.
+        if (
+            cacheable and not fast and result.get("response")
+            and not result.get("requires_human_review")
+            and not result["analysis"]["required_actions"]
+        ):
+            self.response_cache.put(email_data, {
+                "response": result["response"],
+                "analysis": result["analysis"],
+                "context_used": result["context_used"],
+            })
+        return result
+
+    async def _replay_cached(self, email_data: Dict[str, Any], cached: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer a duplicate email with a cached reply.
+
+        The guardrail check and the review gate still run for this email, so
+        its own draft is saved (or sent for review); none of the earlier
+        run's actions are reported.
+        """
+        state = self._initial_state(email_data)
+        state.context = cached["context_used"]
+        state.metadata = replace(
+            state.metadata, analysis=cached["analysis"], draft_response=cached["response"]
+        )
+        guard = self._guardrail_check(state)
+        state.guardrail_result = guard["guardrail_result"]
+        state.requires_human_review = guard["requires_human_review"]
+        gate = await self._human_review_gate(state)
+        return self._format_result({
+            **guard,
+            **gate,
+            "metadata": _merge_metadata(state.metadata, gate["metadata"]),
+            "context": state.context,
+        })
+
+    @staticmethod
+    def _thread_id(email_data: Dict[str, Any]) -> Optional[str]:
+        """Checkpoint thread for retries of this exact email, or None without a stable id.
+
+        Ids such as IMAP UIDs are only unique per account and folder, so the
+        thread is keyed on the id plus a hash of the whole input.
+        """
+        stable_id = email_data.get("id") or (email_data.get("metadata") or {}).get("message_id")
+        if stable_id is None:
+            return None
+        digest = hashlib.sha256(_serialize_context(email_data).encode()).hexdigest()[:16]
+        return f"{stable_id}:{digest}"
+
+    async def _run_graph(self, graph: Any, email_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the graph, resuming an earlier failed run of the same email when checkpointed."""
+        if graph.checkpointer is None:
+            return await graph.ainvoke(self._initial_state(email_data))
+
+        # Callers that retry pass a stable id; anything else gets a one-off thread
+        stable_thread = self._thread_id(email_data)
+        thread_id = stable_thread or uuid.uuid4().hex
+        config = {"configurable": {"thread_id": thread_id}}
+
+        graph_input = self._initial_state(email_data)
+        if stable_thread is not None:
+            snapshot = await graph.aget_state(config)
+            if snapshot.next and snapshot.values.get("email_data") == email_data:
+                graph_input = None
+                logger.info(f"Resuming email thread {thread_id} at {', '.join(snapshot.next)}")
+            elif snapshot.next:
+                # Same key, different input: never continue someone else's run
+                await graph.checkpointer.adelete_thread(thread_id)
+
+        try:
+            result = await graph.ainvoke(graph_input, config=config)
+        except Exception:
+            # Keep the checkpoint only when a retry can find it again
+            if stable_thread is None:
+                await graph.checkpointer.adelete_thread(thread_id)
+            raise
+        await graph.checkpointer.adelete_thread(thread_id)
+        return result
+
+    def _is_cacheable(self, email_data: Dict[str, Any]) -> bool:
+        """Sends and attachment-dependent replies always run the full graph."""
+        return (
+            self.response_cache is not None
+            and not email_data.get("auto_send")
+            and not email_data.get("attachments")
+        )
+
+    async def process_email_stream(self, email_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Process an email, yielding node progress and response tokens as they arrive.
+
+        Emits ``{"type": "node"}`` when a graph node starts, ``{"type": "action"}``
+        as each executed action completes, ``{"type": "token"}`` for each chunk
+        of the drafted reply, and a final ``{"type": "result"}`` with the same
+        payload ``process_email`` returns.
+        """
+        final_state = None
+        # A checkpointed graph needs a thread; streamed runs are not resumed,
+        # so each gets a one-off thread that is dropped afterwards
+        config = None
+        if self.agent.checkpointer is not None:
+            config = {"configurable": {"thread_id": uuid.uuid4().hex}}
+
+        try:
+            async for event in self.agent.astream_events(
+                self._initial_state(email_data), config=config, version="v2"
+            ):
+                kind = event["event"]
+                node = event.get("metadata", {}).get("langgraph_node")
+
+                if kind == "on_chat_model_stream" and node == "generate_response":
+                    content = event["data"]["chunk"].content
+                    if content:
+                        yield {"type": "token", "content": content}
+                elif kind == "on_chain_start" and node and event["name"] == node:
+                    yield {"type": "node", "node": node}
+                elif kind == "on_custom_event" and event["name"] == "action":
+                    yield {"type": "action", "action": event["data"]}
+                elif kind == "on_chain_end" and not event.get("parent_ids"):
+                    final_state = event["data"].get("output")
+        finally:
+            if config is not None:
+                await self.agent.checkpointer.adelete_thread(config["configurable"]["thread_id"])
+
+        if final_state is not None:
+            yield {"type": "result", "result": self._format_result(final_state)}
+
+
+_AGENT_SINGLETON: Optional[EmailAssistantAgent] = None
+_AGENT_LOCK = threading.Lock()
+
+
+def get_agent() -> EmailAssistantAgent:
+    """Return the process-wide agent, building it (and its graph) on first use.
+
+    FastAPI runs this sync dependency in its threadpool, so the first build is
+    guarded to keep concurrent first requests from constructing two agents.
+    """
+    global _AGENT_SINGLETON
+    if _AGENT_SINGLETON is None:
+        with _AGENT_LOCK:
+            if _AGENT_SINGLETON is None:
+                _AGENT_SINGLETON = EmailAssistantAgent()
+    return _AGENT_SINGLETON
+
+
+def reset_agent() -> None:
+    """Drop the process-wide agent so the next ``get_agent()`` rebuilds it and its graph.
+
+    For tests that patch nodes or settings; draft saves still queued by the
+    old agent are not drained (sends are never queued).
+    """
+    global _AGENT_SINGLETON
+    with _AGENT_LOCK:
+        _AGENT_SINGLETON = None
+
 
-# Export a module-level graph instance for LangGraph dev server
-email_graph = EmailAssistantAgent()._build_agent_graph()
\ No newline at end of file
+def __getattr__(name: str):
+    """Expose ``email_graph`` for the LangGraph dev server without building it at import."""
+    if name == "email_graph":
+        return get_agent().agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""
+Minimal IMAP FETCH response parsing for the Email Assistant.
+
+imaplib hands FETCH responses back as raw bytes, with literals split out into
+(prefix, literal) tuples. These helpers turn that into per-message
+``{item name: value}`` dicts and pick the readable text section out of a
+BODYSTRUCTURE, so unread-mail listing can fetch headers plus a short slice of
+the text body instead of downloading whole messages with their attachments.
+"""
+
+import binascii
+import quopri
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+# Atoms may carry a bracketed section spec with spaces and parens inside,
+# e.g. BODY[HEADER.FIELDS (SUBJECT FROM)] or BODY[1]<0>.
+_TOKEN_RE = re.compile(
+    rb'\s*(?:(\()|(\))|"((?:[^"\\]|\\.)*)"|\{(\d+)\}$|([^\s()"\[]+(?:\[[^\]]*\](?:<\d+>)?)?))'
+)
+_UNESCAPE_RE = re.compile(rb'\\(.)')
+
+_OPEN, _CLOSE = object(), object()
+
+Value = Union[None, bytes, List[Any]]
+
+
+def _tokens(data: List[Union[bytes, Tuple[bytes, bytes]]]) -> Iterator[Any]:
+    for element in data:
+        if isinstance(element, tuple):
+            prefix, literal = element[0], element[1]
+        else:
+            prefix, literal = element, None
+        pos = 0
+        while pos < len(prefix):
+            match = _TOKEN_RE.match(prefix, pos)
+            if match is None or match.end() == pos:
+                break
+            pos = match.end()
+            opening, closing, quoted, size, atom = match.groups()
+            if opening:
+                yield _OPEN
+            elif closing:
+                yield _CLOSE
+            elif quoted is not None:
+                yield _UNESCAPE_RE.sub(rb'\1', quoted)
+            elif size is not None:
+                yield literal
+            elif atom is not None:
+                yield None if atom.upper() == b'NIL' else atom
+
+
+def _build(tokens: Iterator[Any]) -> List[Value]:
+    items: List[Value] = []
+    for token in tokens:
+        if token is _OPEN:
+            items.append(_build(tokens))
+        elif token is _CLOSE:
+            return items
+        else:
+            items.append(token)
+    return items
+
+
+def parse_fetch_response(
+    data: List[Union[bytes, Tuple[bytes, bytes]]],
+    key: Optional[bytes] = None,
+) -> Dict[bytes, Dict[bytes, Value]]:
+    """Map each message in an imaplib FETCH response to its data items.
+
+    Messages are keyed by sequence number, or by the ``key`` item (e.g.
+    ``UID`` for UID FETCH responses). Item names are upper-cased, e.g.
+    ``BODYSTRUCTURE`` or ``BODY[1]<0>``.
+    """
+    parsed = _build(_tokens(data))
+    messages: Dict[bytes, Dict[bytes, Value]] = {}
+    for msg_id, items in zip(parsed[::2], parsed[1::2]):
+        if isinstance(msg_id, bytes) and isinstance(items, list):
+            fields: Dict[bytes, Value] = {}
+            for name, value in zip(items[::2], items[1::2]):
+                if isinstance(name, bytes):
+                    fields[name.upper()] = value
+            msg_key = fields.get(key) if key else msg_id
+            if isinstance(msg_key, bytes):
+                messages.setdefault(msg_key, {}).update(fields)
+    return messages
+
+
+def find_item(fields: Dict[bytes, Value], prefix: bytes) -> Value:
+    """Return the first data item whose name starts with ``prefix``."""
+    for name, value in fields.items():
+        if name.startswith(prefix):
+            return value
+    return None
+
+
+def _params(value: Value) -> Dict[bytes, bytes]:
+    if not isinstance(value, list):
+        return {}
+    return {
+        key.upper(): val
+        for key, val in zip(value[::2], value[1::2])
+        if isinstance(key, bytes) and isinstance(val, bytes)
+    }
+
+
+def _text_parts(structure: Value, section: str = "") -> Iterator[Tuple[str, bytes, bytes, str]]:
+    if not isinstance(structure, list) or not structure:
+        return
+    if isinstance(structure[0], list):
+        # Multipart: child bodies first, then the multipart subtype
+        for index, child in enumerate(structure, 1):
+            if not isinstance(child, list):
+                break
+            yield from _text_parts(child, f"{section}.{index}" if section else str(index))
+        return
+    if len(structure) < 6 or not isinstance(structure[0], bytes) or not isinstance(structure[1], bytes):
+        return
+    if structure[0].upper() != b'TEXT' or structure[1].upper() not in (b'PLAIN', b'HTML'):
+        return
+    charset = _params(structure[2]).get(b'CHARSET', b'utf-8').decode('ascii', 'ignore')
+    encoding = structure[5].upper() if isinstance(structure[5], bytes) else b'7BIT'
+    yield section or "1", structure[1].upper(), encoding, charset
+
+
+def text_section(structure: Value) -> Optional[Tuple[str, bytes, bytes, str]]:
+    """Find the body text part in a BODYSTRUCTURE: the first text/plain, else the first text/html.
+
+    Returns ``(section, subtype, transfer encoding, charset)`` or None, with
+    the same preference as ``EmailMessage.get_body(('plain', 'html'))``.
+    """
+    html = None
+    for part in _text_parts(structure):
+        if part[1] == b'PLAIN':
+            return part
+        html = html or part
+    return html
+
+
+def has_filename(structure: Value) -> bool:
+    """True when any part declares a file name (Content-Type name or Content-Disposition filename)."""
+    if not isinstance(structure, list):
+        return False
+    for key, value in zip(structure, structure[1:]):
+        if isinstance(key, bytes) and key.upper() in (b'NAME', b'FILENAME') and value:
+            return True
+    return any(has_filename(value) for value in structure if isinstance(value, list))
+
+
+def decode_preview(payload: bytes, encoding: bytes, charset: str) -> str:
+    """Decode a (possibly truncated) slice of a text part."""
+    if encoding == b'BASE64':
+        data = b''.join(payload.split())
+        data = binascii.a2b_base64(data[: len(data) - len(data) % 4])
+    elif encoding == b'QUOTED-PRINTABLE':
+        data = quopri.decodestring(payload)
+    else:
+        data = payload
+    try:
+        return data.decode(charset, errors='ignore')
+    except LookupError:
+        return data.decode('utf-8', errors='ignore')
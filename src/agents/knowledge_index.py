@@ -0,0 +1,206 @@
+"""
+BM25 inverted index over the internal knowledge base.
+
+Documents (``.txt`` / ``.md`` files under the knowledge-base directory) are
+tokenized once into per-term posting lists and the index is saved as JSON
+next to them (plain data, since the directory is user-managed). Searches
+re-stat the directory at most every _REFRESH_INTERVAL seconds and re-index
+only files whose mtime or size changed. Between refreshes a lookup scores
+just the documents that share a term with the query, so it costs
+O(postings of the query terms) rather than a scan of every file.
+"""
+
+import heapq
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+_TOKEN_RE = re.compile(r"\w+")
+_EXTENSIONS = (".txt", ".md")
+_INDEX_FILE = ".index.json"
+_INDEX_VERSION = 2
+_SNIPPET_CHARS = 300
+# Seconds between directory walks; edits show up in searches after at most this
+_REFRESH_INTERVAL = 5.0
+
+# Standard BM25 parameters (term-frequency saturation and length normalisation)
+_K1 = 1.5
+_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class _Document:
+    __slots__ = ("stamp", "length", "terms", "snippet")
+
+    def __init__(self, stamp: Tuple[int, int], length: int, terms: Counter, snippet: str):
+        self.stamp = stamp
+        self.length = length
+        self.terms = terms
+        self.snippet = snippet
+
+
+class KnowledgeIndex:
+    """Incrementally maintained BM25 index of one knowledge-base directory."""
+
+    def __init__(self, path: str, refresh_interval: float = _REFRESH_INTERVAL):
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self._refreshed_at: Optional[float] = None
+        self._docs: Dict[str, _Document] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _files(self, directory: str) -> Iterator[os.DirEntry]:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith("."):
+                        yield from self._files(entry.path)
+                elif entry.name.endswith(_EXTENSIONS) and entry.is_file():
+                    yield entry
+
+    def _add(self, rel_path: str, doc: _Document) -> None:
+        self._docs[rel_path] = doc
+        self._total_length += doc.length
+        for term, count in doc.terms.items():
+            self._postings.setdefault(term, {})[rel_path] = count
+
+    def _remove(self, rel_path: str) -> None:
+        doc = self._docs.pop(rel_path)
+        self._total_length -= doc.length
+        for term in doc.terms:
+            postings = self._postings[term]
+            del postings[rel_path]
+            if not postings:
+                del self._postings[term]
+
+    def _load(self) -> None:
+        self._loaded = True
+        try:
+            with open(os.path.join(self.path, _INDEX_FILE), encoding="utf-8") as f:
+                data = json.load(f)
+            if data["version"] != _INDEX_VERSION:
+                return
+            docs = {
+                str(rel_path): _Document(
+                    (int(mtime_ns), int(size)),
+                    int(length),
+                    Counter({str(term): int(count) for term, count in terms.items()}),
+                    str(snippet),
+                )
+                for rel_path, (mtime_ns, size, length, terms, snippet) in data["docs"].items()
+            }
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable knowledge index: {e}")
+            return
+        for rel_path, doc in docs.items():
+            self._add(rel_path, doc)
+
+    def _save(self) -> None:
+        index_path = os.path.join(self.path, _INDEX_FILE)
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        try:
+            docs = {
+                rel_path: [*doc.stamp, doc.length, doc.terms, doc.snippet]
+                for rel_path, doc in self._docs.items()
+            }
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": _INDEX_VERSION, "docs": docs}, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, index_path)
+        except OSError as e:
+            logger.warning(f"Could not persist knowledge index: {e}")
+
+    def refresh(self) -> None:
+        """Re-index new and modified files and drop deleted ones."""
+        if not self._loaded:
+            self._load()
+        seen = set()
+        changed = False
+        for entry in self._files(self.path):
+            stat = entry.stat()
+            rel_path = os.path.relpath(entry.path, self.path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            seen.add(rel_path)
+            current = self._docs.get(rel_path)
+            if current is not None and current.stamp == stamp:
+                continue
+            try:
+                with open(entry.path, encoding="utf-8", errors="ignore") as f:
+                    text = f.read()
+            except OSError as e:
+                logger.warning(f"Skipping unreadable knowledge file {entry.path}: {e}")
+                continue
+            tokens = tokenize(text)
+            if current is not None:
+                self._remove(rel_path)
+            self._add(rel_path, _Document(stamp, len(tokens), Counter(tokens), text[:_SNIPPET_CHARS]))
+            changed = True
+        for rel_path in [p for p in self._docs if p not in seen]:
+            self._remove(rel_path)
+            changed = True
+        if changed:
+            self._save()
+
+    def search(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+        """Return the best BM25 matches for ``query``."""
+        with self._lock:
+            if not os.path.isdir(self.path):
+                return []
+            now = time.monotonic()
+            if self._refreshed_at is None or now - self._refreshed_at >= self.refresh_interval:
+                self.refresh()
+                self._refreshed_at = now
+            n_docs = len(self._docs)
+            if not n_docs:
+                return []
+            avg_length = self._total_length / n_docs or 1.0
+
+            scores: Dict[str, float] = {}
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for rel_path, tf in postings.items():
+                    norm = _K1 * (1 - _B + _B * self._docs[rel_path].length / avg_length)
+                    scores[rel_path] = scores.get(rel_path, 0.0) + idf * tf * (_K1 + 1) / (tf + norm)
+
+            return [
+                {
+                    "title": os.path.basename(rel_path),
+                    "source": rel_path,
+                    "snippet": self._docs[rel_path].snippet,
+                    "score": round(score, 4),
+                }
+                for rel_path, score in heapq.nlargest(max_results, scores.items(), key=lambda item: item[1])
+            ]
+
+
+_INDEXES: Dict[str, KnowledgeIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_knowledge_index(path: Optional[str]) -> Optional[KnowledgeIndex]:
+    """Process-wide index for ``path`` (None when no knowledge base is configured)."""
+    if not path:
+        return None
+    path = os.path.abspath(path)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(path)
+        if index is None:
+            index = _INDEXES[path] = KnowledgeIndex(path)
+        return index
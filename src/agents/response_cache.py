@@ -0,0 +1,127 @@
+"""
+Duplicate response cache for the Email Assistant.
+
+Many inbound emails repeat ones already answered (retried webhooks, status
+pings, auto-replies). This cache stores the processed result per sender,
+keyed by a hash of the subject + body with case and whitespace normalised,
+and returns it for an exact repeat, skipping both LLM round trips.
+
+With ``fuzzy=True`` it also answers near-copies whose cosine similarity to a
+stored email clears the threshold. That is opt-in: emails differing only in a
+date, amount or ID score as near-identical, yet need a different reply.
+Vectors are unigram + bigram counts, so no embedding model or vector store is
+needed; fuzzy lookups are a linear scan over a small, bounded LRU.
+"""
+
+import copy
+import hashlib
+import math
+import re
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+SparseVector = Dict[str, float]
+
+
+def embed(text: str) -> SparseVector:
+    """Return an L2-normalised unigram + bigram count vector for ``text``."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    counts = Counter(tokens)
+    counts.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    norm = math.sqrt(sum(c * c for c in counts.values()))
+    if not norm:
+        return {}
+    return {term: c / norm for term, c in counts.items()}
+
+
+@lru_cache(maxsize=128)
+def _embed_cached(text: str) -> SparseVector:
+    # A miss embeds the same email twice (lookup, then store after the graph
+    # runs); memoizing by text makes the second call free. Callers must not
+    # mutate the shared vector.
+    return embed(text)
+
+
+def cosine(a: SparseVector, b: SparseVector) -> float:
+    """Cosine similarity of two normalised sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    # Runs once per cached entry on every lookup, so bind the method once
+    b_get = b.get
+    return sum(weight * b_get(term, 0.0) for term, weight in a.items())
+
+
+class ResponseCache:
+    """Bounded LRU of processed results per sender, matched exactly or (opt-in) by similarity."""
+
+    def __init__(self, threshold: float = 0.93, max_entries: int = 512, fuzzy: bool = False):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.fuzzy = fuzzy
+        # (sender, text digest) -> (vector, only kept when fuzzy; result)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Optional[SparseVector], Dict[str, Any]]]" = OrderedDict()
+
+    @staticmethod
+    def _text(email_data: Dict[str, Any]) -> str:
+        return f"{email_data.get('subject') or ''}\n{email_data.get('body') or ''}"
+
+    @staticmethod
+    def _digest(text: str) -> str:
+        # Case and whitespace only; every other character (digits, currency
+        # signs, punctuation in IDs) must match for a hit
+        return hashlib.sha256(" ".join(text.lower().split()).encode()).hexdigest()
+
+    @staticmethod
+    def _sender(email_data: Dict[str, Any]) -> str:
+        # Drafts usually address the sender by name, so never share across senders
+        return str(email_data.get("from_email") or email_data.get("from") or "").lower()
+
+    def get(self, email_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result for a duplicate email, if any."""
+        sender = self._sender(email_data)
+        text = self._text(email_data)
+        if not text.strip():
+            return None
+        best_key = (sender, self._digest(text))
+        if best_key in self._entries:
+            self._entries.move_to_end(best_key)
+            return copy.deepcopy(self._entries[best_key][1])
+        if not self.fuzzy:
+            return None
+
+        vector = _embed_cached(text)
+        if not vector:
+            return None
+
+        best_key, best_score = None, self.threshold
+        for key, (cached_vector, _) in self._entries.items():
+            if key[0] != sender or cached_vector is None:
+                continue
+            score = cosine(vector, cached_vector)
+            if score >= best_score:
+                best_key, best_score = key, score
+
+        if best_key is None:
+            return None
+        self._entries.move_to_end(best_key)
+        return copy.deepcopy(self._entries[best_key][1])
+
+    def put(self, email_data: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """Store a processed result, evicting the least recently used entry when full."""
+        text = self._text(email_data)
+        if not text.strip():
+            return
+        key = (self._sender(email_data), self._digest(text))
+        self._entries[key] = (_embed_cached(text) if self.fuzzy else None, copy.deepcopy(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
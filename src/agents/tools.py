@@ -1,12 +1,440 @@
-from langchain.tools import tool
-from typing import List, Dict, Any, Optional
+from langchain_core.tools import tool
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-import requests
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-import requests
-from bs4 import BeautifulSoup
+from functools import lru_cache
+from loguru import logger
+import atexit
+import imaplib
+import os
+import re
+import threading
+import time
+from email.policy import compat32
+
+from src.agents.context_cache import TTLCache
+from src.agents.imap_parse import (
+    decode_preview,
+    find_item,
+    has_filename,
+    parse_fetch_response,
+    text_section,
+)
+from src.core.config import settings
+
+_SMTP_ACCOUNT = ("smtp.gmail.com", 587, "username", "password")
+_FROM_ADDRESS = "assistant@company.com"
+
+
+def _message_template(
+    subject: str,
+    body: str,
+    cc: Tuple[str, ...] = (),
+    attachments: Tuple[str, ...] = (),
+) -> str:
+    """Serialize everything of an email except its To header."""
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+
+    msg = MIMEMultipart()
+    msg['From'] = _FROM_ADDRESS
+    msg['Subject'] = subject
+
+    if cc:
+        msg['Cc'] = ', '.join(cc)
+
+    msg.attach(MIMEText(body, 'html'))
+
+    # Add attachments if any
+    if attachments:
+        # Attachment handling code
+        pass
+
+    return msg.as_string()
+
+
+def _build_message(
+    to: List[str],
+    subject: str,
+    body: str,
+    cc: Optional[List[str]] = None,
+    bcc: Optional[List[str]] = None,
+    attachments: Optional[List[str]] = None,
+    templates: Optional[Dict[Tuple, str]] = None,
+) -> Tuple[str, List[str], str]:
+    """Build the SMTP envelope (from, recipients, message) for one email.
+
+    Emails that differ only in their recipients share one serialized
+    template through ``templates``; each gets just its own To header.
+    """
+    key = (subject, body, tuple(cc or ()), tuple(attachments or ()))
+    template = templates.get(key) if templates is not None else None
+    if template is None:
+        template = _message_template(*key)
+        if templates is not None:
+            templates[key] = template
+    to_header = compat32.fold('To', ', '.join(to))
+    return _FROM_ADDRESS, to + (cc or []) + (bcc or []), to_header + template
+
+
+# Logged-in IMAP sessions kept per (host, username) so repeated inbox polls
+# skip the TLS handshake and LOGIN. A session idle longer than
+# _IMAP_IDLE_CHECK seconds is NOOP-checked before reuse (servers drop idle
+# sessions after ~30 minutes) and discarded when that or any command aborts.
+#
+# Providers cap concurrent connections per account (settings.IMAP_MAX_CONNECTIONS,
+# Gmail allows 15) across every worker process, so each process gets an equal
+# share: _IMAP_MAX_SESSIONS bounds both the idle sessions kept per account and
+# the parallel sessions one listing opens. The worker count comes from
+# WEB_CONCURRENCY, which uvicorn reads and deploy.py sets for its workers.
+_IMAP_IDLE_CHECK = 60.0
+_IMAP_MAX_SESSIONS = max(1, settings.IMAP_MAX_CONNECTIONS // int(os.environ.get("WEB_CONCURRENCY") or 1))
+
+
+class _PooledIMAP:
+    __slots__ = ("client", "last_used")
+
+    def __init__(self, client: imaplib.IMAP4_SSL):
+        self.client = client
+        self.last_used = time.monotonic()
+
+
+# Idle sessions per account. A session is checked out by one caller at a
+# time, since imaplib connections are not safe to share between threads.
+_IMAP_POOL: Dict[Tuple[str, str], List[_PooledIMAP]] = {}
+_IMAP_POOL_LOCK = threading.Lock()
+
+
+def _imap_alive(entry: _PooledIMAP) -> bool:
+    if time.monotonic() - entry.last_used < _IMAP_IDLE_CHECK:
+        return True
+    try:
+        return entry.client.noop()[0] == 'OK'
+    except (imaplib.IMAP4.error, OSError):
+        return False
+
+
+def _imap_logout(client: imaplib.IMAP4_SSL) -> None:
+    try:
+        client.logout()
+    except (imaplib.IMAP4.error, OSError):
+        pass
+
+
+def _imap_acquire(key: Tuple[str, str], password: str) -> _PooledIMAP:
+    """Check out a live idle session for ``key``, logging in when there is none."""
+    while True:
+        with _IMAP_POOL_LOCK:
+            idle = _IMAP_POOL.get(key)
+            entry = idle.pop() if idle else None
+        if entry is None:
+            host, username = key
+            client = imaplib.IMAP4_SSL(host)
+            try:
+                client.login(username, password)
+            except Exception:
+                _imap_logout(client)
+                raise
+            return _PooledIMAP(client)
+        if _imap_alive(entry):
+            return entry
+        _imap_logout(entry.client)
+
+
+def _imap_release(key: Tuple[str, str], entry: _PooledIMAP) -> None:
+    entry.last_used = time.monotonic()
+    with _IMAP_POOL_LOCK:
+        idle = _IMAP_POOL.setdefault(key, [])
+        if len(idle) < _IMAP_MAX_SESSIONS:
+            idle.append(entry)
+            return
+    _imap_logout(entry.client)
+
+
+@contextmanager
+def _imap_session(host: str, username: str, password: str) -> Iterator[imaplib.IMAP4_SSL]:
+    """Yield a logged-in IMAP client for (host, username), reconnecting as needed."""
+    key = (host, username)
+    entry = _imap_acquire(key, password)
+    try:
+        yield entry.client
+    except (imaplib.IMAP4.abort, OSError):
+        # The connection is unusable; drop it so the next call reconnects
+        _imap_logout(entry.client)
+        raise
+    except BaseException:
+        _imap_release(key, entry)
+        raise
+    _imap_release(key, entry)
+
+
+@atexit.register
+def _close_imap_sessions() -> None:
+    with _IMAP_POOL_LOCK:
+        idle = [entry for entries in _IMAP_POOL.values() for entry in entries]
+        _IMAP_POOL.clear()
+    for entry in idle:
+        _imap_logout(entry.client)
+
+
+@lru_cache(maxsize=1)
+def _imap_summary_cache():
+    """Cache of unread-mail summaries: on disk with diskcache, else in memory.
+
+    Both are bounded (entries in memory, bytes on disk, least recently used
+    evicted first) and entries expire after IMAP_CACHE_TTL seconds.
+    """
+    try:
+        import diskcache
+    except ImportError:  # summaries are then cached in memory only
+        return TTLCache(maxsize=settings.IMAP_CACHE_SIZE, ttl=settings.IMAP_CACHE_TTL)
+    return diskcache.Cache(
+        settings.IMAP_CACHE_PATH,
+        size_limit=settings.IMAP_CACHE_DISK_LIMIT,
+        eviction_policy="least-recently-used",
+    )
+
+
+# Same matches as the old '<[^<]+?>' (the first character after '<' may be
+# '>'), but the tag body is a greedy run to the next '>' instead of a lazy
+# quantifier that re-tries the closing '>' after every character.
+_TAG_RE = re.compile('<[^<][^<>]*>')
+
+
+@lru_cache(maxsize=1)
+def _html_parser():
+    """Lexbor-backed (C) HTML parser class, much faster than a Python-level pass; None if missing."""
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+    except ImportError:
+        return None
+    return LexborHTMLParser
+
+
+def _html_to_text(html: str) -> str:
+    """Plain text of an HTML email body (script/style contents dropped)."""
+    HTMLParser = _html_parser()
+    if HTMLParser is None:
+        return _TAG_RE.sub('', html)
+    tree = HTMLParser(html)
+    tree.strip_tags(['script', 'style'])
+    return tree.body.text(separator=' ', strip=True) if tree.body else ''
+
+
+# UIDs per FETCH command; larger sets risk a BAD "request too long" reply
+_FETCH_BATCH = 100
+
+
+def _uid_set(uids: List[bytes]) -> bytes:
+    """IMAP sequence set for ``uids``, collapsing consecutive runs (b'4,7:9')."""
+    numbers = sorted({int(uid) for uid in uids})
+    runs = []
+    start = prev = numbers[0]
+    for number in numbers[1:]:
+        if number != prev + 1:
+            runs.append(b'%d' % start if start == prev else b'%d:%d' % (start, prev))
+            start = number
+        prev = number
+    runs.append(b'%d' % start if start == prev else b'%d:%d' % (start, prev))
+    return b','.join(runs)
+
+
+def _uid_fetch(
+    imap: imaplib.IMAP4_SSL, fetches: List[Tuple[List[bytes], str]]
+) -> Tuple[str, Dict[bytes, Dict[bytes, Any]]]:
+    """UID FETCH each ``(uids, items)`` pair in batches, keyed by UID.
+
+    When there is more than one command they are pipelined (RFC 3501 5.5):
+    all are sent before any reply is read, so the whole set costs about one
+    round trip. The replies can be told apart because each carries its UID.
+    The status is 'OK' only if every command succeeded; data from the
+    successful ones is returned either way.
+    """
+    commands = [
+        (_uid_set(uids[i:i + _FETCH_BATCH]), items)
+        for uids, items in fetches
+        for i in range(0, len(uids), _FETCH_BATCH)
+    ]
+    if len(commands) == 1:
+        status, data = imap.uid('FETCH', *commands[0])
+        return status, parse_fetch_response(data, key=b'UID') if status == 'OK' else {}
+
+    # imaplib only exposes lock-step commands, so pipeline with its own
+    # send/complete halves (what IMAP4.uid does for a single command)
+    tags = [imap._command('UID', 'FETCH', uid_set, items) for uid_set, items in commands]
+    status = 'OK'
+    for tag in tags:
+        try:
+            typ, _ = imap._command_complete('UID', tag)
+        except imaplib.IMAP4.abort:
+            raise
+        except imaplib.IMAP4.error:
+            typ = 'BAD'
+        if typ != 'OK':
+            status = typ
+    _, data = imap._untagged_response('OK', [None], 'FETCH')
+    return status, parse_fetch_response(data, key=b'UID')
+
+
+# Unread-mail listing only needs these headers and the first few hundred
+# characters of the text body, so that is all it fetches.
+_HEADER_ITEM = 'BODY.PEEK[HEADER.FIELDS (SUBJECT FROM TO DATE)]'
+# Encoded bytes fetched per text part to fill the 500-character preview.
+# Plain text needs at most ~4 bytes per character after base64 or
+# quoted-printable decoding. HTML gets more room for the markup that is
+# stripped out.
+_BODY_PREVIEW_BYTES = {b'PLAIN': 4096, b'HTML': 16384}
+
+
+def _fetch_summaries(imap: imaplib.IMAP4_SSL, uids: List[bytes]) -> Dict[bytes, Dict[str, Any]]:
+    """Summaries of messages ``uids`` in the folder selected on ``imap``, keyed by UID."""
+    import email
+    import email.policy
+
+    # One round trip for the headers and MIME structure of every
+    # message; bodies follow, fetching only a slice of the text part
+    # so attachments are never downloaded.
+    status, fetched = _uid_fetch(imap, [(uids, f'(BODYSTRUCTURE {_HEADER_ITEM})')])
+    if status != 'OK':
+        raise Exception("Failed to fetch unread emails")
+
+    summaries = {}
+    text_parts = {}
+    by_section: Dict[Tuple[str, bytes], List[bytes]] = {}
+    full_ids = []
+    for email_id in uids:
+        structure = fetched.get(email_id, {}).get(b'BODYSTRUCTURE')
+        if structure is None:
+            full_ids.append(email_id)
+            continue
+        text_parts[email_id] = text_section(structure)
+        if text_parts[email_id]:
+            section, subtype = text_parts[email_id][:2]
+            by_section.setdefault((section, subtype), []).append(email_id)
+
+    # Text previews, plus whole messages for servers that omit
+    # BODYSTRUCTURE, all pipelined into one round trip
+    fetches = [
+        (ids, f'(BODY.PEEK[{section}]<0.{_BODY_PREVIEW_BYTES[subtype]}>)')
+        for (section, subtype), ids in by_section.items()
+    ]
+    if full_ids:
+        fetches.append((full_ids, '(RFC822)'))
+    previews, raw_emails = {}, {}
+    if fetches:
+        status, data = _uid_fetch(imap, fetches)
+        if status != 'OK':
+            # Fetch whatever a rejected command left out as whole messages,
+            # rather than returning (and caching) summaries with empty bodies
+            missing = [email_id for ids, _ in fetches for email_id in ids if email_id not in data]
+            if missing:
+                status, retried = _uid_fetch(imap, [(missing, '(RFC822)')])
+                if status != 'OK':
+                    raise Exception("Failed to fetch unread emails")
+                data.update(retried)
+        for email_id, fields in data.items():
+            if fields.get(b'RFC822') is not None:
+                raw_emails[email_id] = fields[b'RFC822']
+            else:
+                previews[email_id] = find_item(fields, b'BODY[')
+
+    for email_id in uids:
+        try:
+            # Parse email; the default policy decodes every RFC 2047
+            # encoded-word of a header, not just the first
+            raw = raw_emails[email_id] if email_id in raw_emails else find_item(fetched[email_id], b'BODY[HEADER')
+            msg = email.message_from_bytes(raw or b'', policy=email.policy.default)
+            
+            # Extract email details
+            subject = str(msg.get('Subject', ''))
+            from_addr = str(msg.get('From', ''))
+            to_addr = str(msg.get('To', ''))
+            date = str(msg.get('Date', ''))
+            
+            # Extract body
+            body = ""
+            if email_id not in raw_emails:
+                text_part = text_parts.get(email_id)
+                if text_part and previews.get(email_id):
+                    _, subtype, encoding, charset = text_part
+                    body = decode_preview(previews[email_id], encoding, charset)
+                    if subtype == b'HTML':
+                        body = _html_to_text(body)
+                has_attachments = has_filename(fetched[email_id][b'BODYSTRUCTURE'])
+            else:
+                # Plain text when the message has it, so an HTML
+                # alternative is never decoded for nothing
+                part = msg.get_body(preferencelist=('plain', 'html'))
+                if part is not None:
+                    try:
+                        body = part.get_content()
+                    except (LookupError, ValueError):
+                        body = part.get_payload(decode=True).decode('utf-8', errors='ignore')
+                    if part.get_content_subtype() == 'html':
+                        # Remove HTML tags for plain text
+                        body = _html_to_text(body)
+                has_attachments = any(part.get_filename() for part in msg.walk())
+            
+            summaries[email_id] = {
+                "id": email_id.decode('utf-8'),
+                "subject": subject,
+                "from": from_addr,
+                "to": to_addr,
+                "body": body[:500] + "..." if len(body) > 500 else body,
+                "received": date,
+                "has_attachments": has_attachments
+            }
+            
+        except (imaplib.IMAP4.abort, OSError):
+            # Connection lost; let the session be dropped
+            raise
+        except Exception as e:
+            # Skip problematic emails but continue processing others
+            continue
+
+    return summaries
+
+
+# Messages per session before get_unread_emails spreads a listing over more
+# parallel sessions; below this an extra login costs more than it saves.
+_IMAP_SHARD_MIN = 50
+
+
+def _fetch_folder_summaries(
+    host: str,
+    username: str,
+    password: str,
+    folder: str,
+    uidvalidity: Optional[bytes],
+    uids: List[bytes],
+) -> Dict[bytes, Dict[str, Any]]:
+    """_fetch_summaries over a separate pooled session (for parallel listing)."""
+    with _imap_session(host, username, password) as imap:
+        status, _ = imap.select(folder)
+        if status != 'OK':
+            raise Exception(f"Failed to select folder: {folder}")
+        if imap.response('UIDVALIDITY')[1][0] != uidvalidity:
+            raise Exception(f"UIDVALIDITY of {folder} changed during the listing")
+        return _fetch_summaries(imap, uids)
+
+
+_DRAFT_TONES = {
+    "professional": "Write in a formal, business-appropriate tone.",
+    "casual": "Write in a friendly, informal tone.",
+    "urgent": "Write with urgency and importance.",
+    "apologetic": "Write with empathy and apology."
+}
+
+_DRAFT_TEMPLATE = """{tone}
+
+Draft an email with these key points:
+{bullets}
+
+Recipient: {recipient}
+Subject: {subject}
+"""
+
 
 class EmailTools:
     
@@ -20,32 +448,40 @@ class EmailTools:
         attachments: Optional[List[str]] = None
     ) -> str:
         """Send an email to recipients"""
-        try:
-            # Implementation using SMTP
-            msg = MIMEMultipart()
-            msg['From'] = "assistant@company.com"
-            msg['To'] = ', '.join(to)
-            msg['Subject'] = subject
-            
-            if cc:
-                msg['Cc'] = ', '.join(cc)
-            
-            msg.attach(MIMEText(body, 'html'))
-            
-            # Add attachments if any
-            if attachments:
-                # Attachment handling code
-                pass
-            
-            # Send email
-            with smtplib.SMTP("smtp.gmail.com", 587) as server:
-                server.starttls()
-                server.login("username", "password")
-                server.send_message(msg)
-            
+        result = EmailTools.send_emails_batch.func([{
+            "to": to, "subject": subject, "body": body,
+            "cc": cc, "bcc": bcc, "attachments": attachments,
+        }])[0]
+        if result["status"] == "sent":
             return f"Email sent successfully to {to}"
-        except Exception as e:
-            return f"Error sending email: {str(e)}"
+        return f"Error sending email: {result['error']}"
+
+    @tool
+    def send_emails_batch(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send several emails over one SMTP session.
+
+        Each message takes the send_email arguments (to, subject, body, cc,
+        bcc, attachments). Returns {to, status, error} per message.
+        """
+        from src.services.email_sender import smtp_sendmail_batch
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(messages)
+        envelopes, positions, templates = [], [], {}
+        for i, message in enumerate(messages):
+            try:
+                envelopes.append(_build_message(**message, templates=templates))
+                positions.append(i)
+            except Exception as e:
+                results[i] = {"to": message.get("to"), "status": "error", "error": str(e)}
+
+        errors = smtp_sendmail_batch(*_SMTP_ACCOUNT, envelopes) if envelopes else []
+        for i, error in zip(positions, errors):
+            results[i] = {
+                "to": messages[i]["to"],
+                "status": "sent" if error is None else "error",
+                "error": None if error is None else str(error),
+            }
+        return results
     
     @tool
     def draft_email(
@@ -55,24 +491,12 @@ class EmailTools:
         tone: str = "professional"
     ) -> str:
         """Draft an email with specified tone and key points"""
-        tone_map = {
-            "professional": "Write in a formal, business-appropriate tone.",
-            "casual": "Write in a friendly, informal tone.",
-            "urgent": "Write with urgency and importance.",
-            "apologetic": "Write with empathy and apology."
-        }
-        
-        prompt = f"""
-        {tone_map.get(tone, tone_map['professional'])}
-        
-        Draft an email with these key points:
-        {chr(10).join(f'- {point}' for point in key_points)}
-        
-        Recipient: {recipient}
-        Subject: {subject}
-        """
-        
-        return prompt
+        return _DRAFT_TEMPLATE.format(
+            tone=_DRAFT_TONES.get(tone, _DRAFT_TONES['professional']),
+            bullets="- " + "\n- ".join(key_points) if key_points else "",
+            recipient=recipient,
+            subject=subject,
+        )
     
     @tool
     def get_unread_emails(
@@ -84,88 +508,67 @@ class EmailTools:
     ) -> List[Dict[str, Any]]:
         """Retrieve unread emails from specified folder using real IMAP"""
         try:
-            import imaplib
-            import email
-            from email.header import decode_header
-            
-            # Connect to IMAP server
-            with imaplib.IMAP4_SSL(imap_server) as imap:
-                # Login
-                imap.login(username, password)
-                
+            # Reuse the logged-in IMAP session for this server and account
+            with _imap_session(imap_server, username, password) as imap:
                 # Select the folder
                 status, messages = imap.select(folder)
                 if status != 'OK':
                     raise Exception(f"Failed to select folder: {folder}")
+                uidvalidity = imap.response('UIDVALIDITY')[1][0]
                 
-                # Search for unread emails
-                status, email_ids = imap.search(None, '(UNSEEN)')
+                # Search for unread emails by UID, which (with UIDVALIDITY)
+                # names a message stably across sessions
+                status, email_ids = imap.uid('SEARCH', None, '(UNSEEN)')
                 if status != 'OK':
                     raise Exception("Failed to search for unread emails")
                 
-                emails = []
-                email_id_list = email_ids[0].split()[:limit]  # Limit results
+                uid_list = email_ids[0].split()[:limit]  # Limit results
+
+                # Delivered messages never change, so summaries cached under
+                # (account, folder, UIDVALIDITY, UID) need no invalidation
+                cache = _imap_summary_cache() if settings.IMAP_CACHE_ENABLED and uidvalidity else None
+                summaries = {}
+                for uid in uid_list:
+                    summary = cache.get((imap_server, username, folder, uidvalidity, uid)) if cache is not None else None
+                    if summary is not None:
+                        summaries[uid] = summary
+                email_id_list = [uid for uid in uid_list if uid not in summaries]
                 
-                for email_id in email_id_list:
-                    try:
-                        # Fetch email
-                        status, msg_data = imap.fetch(email_id, '(RFC822)')
-                        if status != 'OK':
-                            continue
-                            
-                        # Parse email
-                        raw_email = msg_data[0][1]
-                        msg = email.message_from_bytes(raw_email)
-                        
-                        # Extract email details
-                        subject = decode_header(msg.get('Subject', ''))[0][0]
-                        if isinstance(subject, bytes):
-                            subject = subject.decode('utf-8', errors='ignore')
-                        
-                        from_addr = msg.get('From', '')
-                        to_addr = msg.get('To', '')
-                        date = msg.get('Date', '')
-                        
-                        # Extract body
-                        body = ""
-                        if msg.is_multipart():
-                            for part in msg.walk():
-                                if part.get_content_type() == "text/plain":
-                                    try:
-                                        body = part.get_payload(decode=True).decode('utf-8', errors='ignore')
-                                        break
-                                    except:
-                                        pass
-                                elif part.get_content_type() == "text/html":
-                                    try:
-                                        body = part.get_payload(decode=True).decode('utf-8', errors='ignore')
-                                        # Remove HTML tags for plain text
-                                        import re
-                                        body = re.sub('<[^<]+?>', '', body)
-                                        break
-                                    except:
-                                        pass
-                        else:
+                if not email_id_list:
+                    return [summaries[uid] for uid in uid_list]
+
+                # Large listings are split into UID ranges fetched in parallel,
+                # each over its own session, so the server works on them
+                # concurrently instead of one command queue at a time
+                shards = max(1, min(_IMAP_MAX_SESSIONS, len(email_id_list) // _IMAP_SHARD_MIN))
+                shard_size = -(-len(email_id_list) // shards)
+                slices = [email_id_list[i:i + shard_size] for i in range(0, len(email_id_list), shard_size)]
+                if len(slices) == 1:
+                    fetched = _fetch_summaries(imap, email_id_list)
+                else:
+                    with ThreadPoolExecutor(max_workers=len(slices) - 1, thread_name_prefix="imap") as executor:
+                        futures = [
+                            executor.submit(
+                                _fetch_folder_summaries,
+                                imap_server, username, password, folder, uidvalidity, uids,
+                            )
+                            for uids in slices[1:]
+                        ]
+                        fetched = _fetch_summaries(imap, slices[0])
+                        for future in futures:
                             try:
-                                body = msg.get_payload(decode=True).decode('utf-8', errors='ignore')
-                            except:
-                                body = str(msg.get_payload())
-                        
-                        emails.append({
-                            "id": email_id.decode('utf-8'),
-                            "subject": subject,
-                            "from": from_addr,
-                            "to": to_addr,
-                            "body": body[:500] + "..." if len(body) > 500 else body,
-                            "received": date,
-                            "has_attachments": any(part.get_filename() for part in msg.walk() if part.get_filename())
-                        })
-                        
-                    except Exception as e:
-                        # Skip problematic emails but continue processing others
-                        continue
-                
-                return emails
+                                fetched.update(future.result())
+                            except Exception as e:
+                                # Keep the other ranges rather than failing the listing
+                                logger.warning(f"IMAP fetch on a parallel session failed: {e}")
+
+                for email_id, summary in fetched.items():
+                    summaries[email_id] = summary
+                    if cache is not None:
+                        # Third argument is the TTL (``expire`` for diskcache)
+                        cache.set((imap_server, username, folder, uidvalidity, email_id), summary, settings.IMAP_CACHE_TTL)
+
+                return [summaries[uid] for uid in uid_list if uid in summaries]
                 
         except Exception as e:
             # If IMAP fails, return empty list with error info
@@ -215,19 +618,11 @@ class SearchTools:
         """
         if self.web_search_service:
             try:
-                # Convert engine string to enum if specified
-                search_engine = None
-                if engine != "auto" and self.SearchEngine:
-                    try:
-                        search_engine = self.SearchEngine(engine.lower())
-                    except ValueError:
-                        logger.warning(f"Unknown search engine: {engine}, using auto-selection")
-                
                 # Perform search
                 results = self.web_search_service.search(
                     query=query,
                     max_results=max_results,
-                    engine=search_engine,
+                    engine=self._search_engine(engine),
                     search_type=search_type
                 )
                 
@@ -241,6 +636,56 @@ class SearchTools:
             # Fallback to mock implementation
             return self._get_mock_search_results(query, max_results)
     
+    @tool
+    def web_search_many(
+        self,
+        queries: List[str],
+        max_results: int = 5,
+        engine: str = "auto",
+        search_type: str = "general"
+    ) -> List[Dict[str, Any]]:
+        """
+        Search web for several queries at once; faster than separate web_search calls
+        
+        Args:
+            queries: Search query strings
+            max_results: Maximum number of results per query
+            engine: Search engine to use (serper, tavily, google, bing, auto)
+            search_type: Type of search (general, ai_context, news, academic)
+        """
+        if self.web_search_service:
+            try:
+                results = self.web_search_service.search_many(
+                    queries,
+                    max_results=max_results,
+                    engine=self._search_engine(engine),
+                    search_type=search_type
+                )
+                
+                logger.info(f"Web search ran {len(queries)} queries concurrently")
+                return [
+                    {"query": query, "results": query_results}
+                    for query, query_results in zip(queries, results)
+                ]
+                
+            except Exception as e:
+                logger.error(f"Web search failed: {str(e)}")
+        # Fallback to mock implementation
+        return [
+            {"query": query, "results": self._get_mock_search_results(query, max_results)}
+            for query in queries
+        ]
+    
+    def _search_engine(self, engine: str):
+        """Convert an engine name to the SearchEngine enum (None for auto-selection)"""
+        if engine == "auto" or not self.SearchEngine:
+            return None
+        try:
+            return self.SearchEngine(engine.lower())
+        except ValueError:
+            logger.warning(f"Unknown search engine: {engine}, using auto-selection")
+            return None
+    
     def _get_mock_search_results(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """Get mock search results for fallback"""
         return [
@@ -365,10 +810,19 @@ class SearchTools:
         max_results: int = 5
     ) -> List[Dict[str, Any]]:
         """Search internal knowledge base/documents"""
-        # Implementation using vector store
-        # This would connect to ChromaDB/FAISS
+        # Sparse BM25 over the knowledge-base files; a ChromaDB/FAISS vector
+        # store could replace this for semantic matches
         logger.info(f"Internal knowledge search for: {query}")
-        return []
+        from src.agents.knowledge_index import get_knowledge_index
+
+        index = get_knowledge_index(settings.KNOWLEDGE_BASE_PATH)
+        if index is None:
+            return []
+        try:
+            return index.search(query, max_results)
+        except OSError as e:
+            logger.error(f"Knowledge base search failed: {e}")
+            return []
 
 class CalendarTools:
     """Collection of calendar-related tools for scheduling and time management"""
@@ -471,8 +925,9 @@ class CalendarTools:
     
     def _get_mock_meeting(self, attendees: List[str], subject: str, duration: int) -> Dict[str, Any]:
         """Get mock meeting data for fallback"""
-        meeting_id = f"meet_{datetime.now().timestamp()}"
-        scheduled_time = datetime.now().strftime("%Y-%m-%dT%H:%M:00")
+        now = datetime.now()
+        meeting_id = f"meet_{now.timestamp()}"
+        scheduled_time = now.strftime("%Y-%m-%dT%H:%M:00")
         
         return {
             "success": True,
@@ -535,19 +990,102 @@ class CalendarTools:
                 "message": "Event cancelled (mock implementation)"
             }
 
+@lru_cache(maxsize=None)
+def get_search_tools() -> SearchTools:
+    """Process-wide SearchTools, built on first use (it sets up the search engines)."""
+    return SearchTools()
+
+
+@lru_cache(maxsize=None)
+def get_calendar_tools() -> CalendarTools:
+    """Process-wide CalendarTools, built on first use (it authenticates with Google)."""
+    return CalendarTools()
+
+
+def bind_tool(method_tool, instance):
+    """Return a copy of a ``@tool``-decorated method with ``self`` bound to ``instance``.
+
+    Decorating a method exposes ``self`` as a required tool argument, so the
+    class attribute cannot be invoked directly.
+    """
+    return tool(method_tool.func.__get__(instance))
+
+
+def _read_text_prefix(file_path: str, max_chars: int) -> str:
+    """Decode only the leading bytes of a text file (UTF-8 uses at most 4 per char)"""
+    with open(file_path, 'rb') as f:
+        data = f.read(max_chars * 4)
+    return data.decode('utf-8', errors='ignore')[:max_chars]
+
+def _read_pdf(file_path: str, max_chars: int) -> str:
+    """Extract text page by page, stopping once enough has been collected"""
+    try:
+        # PDFium (C++) extracts text far faster than PyPDF2's pure-Python parser
+        import pypdfium2 as pdfium
+    except ImportError:
+        return _read_pdf_pypdf2(file_path, max_chars)
+
+    parts, total = [], 0
+    pdf = pdfium.PdfDocument(file_path)
+    try:
+        for page in pdf:
+            textpage = page.get_textpage()
+            text = textpage.get_text_range()
+            textpage.close()
+            page.close()
+            parts.append(text)
+            total += len(text) + 1
+            if total >= max_chars:
+                break
+    finally:
+        pdf.close()
+    return "\n".join(parts)[:max_chars]
+
+def _read_pdf_pypdf2(file_path: str, max_chars: int) -> str:
+    from PyPDF2 import PdfReader
+
+    parts, total = [], 0
+    for page in PdfReader(file_path).pages:
+        text = page.extract_text() or ""
+        parts.append(text)
+        total += len(text) + 1
+        if total >= max_chars:
+            break
+    return "\n".join(parts)[:max_chars]
+
+def _read_docx(file_path: str, max_chars: int) -> str:
+    """Extract paragraph text, stopping once enough has been collected"""
+    from docx import Document
+
+    parts, total = [], 0
+    for paragraph in Document(file_path).paragraphs:
+        parts.append(paragraph.text)
+        total += len(paragraph.text) + 1
+        if total >= max_chars:
+            break
+    return "\n".join(parts)[:max_chars]
+
+# Extractors by lower-cased file suffix; anything else is read as text
+_ATTACHMENT_READERS = {
+    '.pdf': _read_pdf,
+    '.docx': _read_docx,
+}
+
+@lru_cache(maxsize=64)
+def _read_attachment_cached(file_path: str, stamp: Tuple[int, int], max_chars: int) -> str:
+    """Extracted text, cached per file version (``stamp`` is mtime and size)"""
+    reader = _ATTACHMENT_READERS.get(os.path.splitext(file_path)[1].lower(), _read_text_prefix)
+    return reader(file_path, max_chars)
+
 class FileTools:
     
     @tool
-    def read_attachment(file_path: str) -> str:
-        """Read and extract text from email attachments"""
-        # Support for PDF, DOCX, TXT, etc.
-        if file_path.endswith('.pdf'):
-            return self._read_pdf(file_path)
-        elif file_path.endswith('.docx'):
-            return self._read_docx(file_path)
-        else:
-            with open(file_path, 'r') as f:
-                return f.read()
+    def read_attachment(file_path: str, max_chars: int = 4000) -> str:
+        """Read and extract up to max_chars of text from an email attachment"""
+        # Support for PDF, DOCX, TXT, etc.; an attachment read again while
+        # unchanged (common across a thread's turns) is served from memory
+        stat = os.stat(file_path)
+        return _read_attachment_cached(file_path, (stat.st_mtime_ns, stat.st_size), max_chars)
     
     @tool
     def save_draft(
@@ -10,8 +10,31 @@ various analysis and response generation stages.
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import asyncio
+import re
 from enum import Enum
 
+# Keyword groups for the rule-based analysis. Each group is one precompiled
+# alternation searched in the lowercased email, so a check is a single C-level
+# scan. Keywords match anywhere, as substrings (prefixes and inflections such
+# as "rescheduled" or "sending" included), like the original `in` checks.
+def _keywords(*keywords: str) -> "re.Pattern[str]":
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+_SCHEDULING_KW = _keywords("meeting", "schedule", "appointment", "calendar")
+_QUESTION_KW = _keywords("?", "question", "how", "what", "when", "where")
+_REQUEST_KW = _keywords("please", "request", "need", "require", "would like")
+_COMPLAINT_KW = _keywords("problem", "issue", "complaint", "wrong", "broken")
+_URGENT_KW = _keywords("urgent", "asap", "immediately", "emergency")
+_HIGH_PRIORITY_KW = _keywords("important", "priority", "high", "critical")
+_LOW_PRIORITY_KW = _keywords("fyi", "info", "low priority", "when convenient")
+# Required action -> its keywords; insertion order decides the order of actions
+_ACTION_KW = {
+    "schedule_meeting": _keywords("schedule", "meeting"),
+    "send_email": _keywords("send", "reply"),
+    "attach_document": _keywords("document", "file"),
+    "search_knowledge_base": _keywords("information", "help"),
+}
+
 # Enum for defining workflow states
 class WorkflowState(Enum):
     """Enumeration of possible workflow states"""
@@ -128,11 +151,13 @@ class EmailWorkflow:
         
         # Simple keyword-based intent analysis
         # In production, this would use NLP/AI for better accuracy
-        intent = self._determine_intent(subject, body)
-        priority = self._determine_priority(subject, body)
+        # Combine and lowercase subject and body once for all keyword checks
+        content = (subject + " " + body).lower()
+        intent = self._determine_intent(content)
+        priority = self._determine_priority(content)
         
         # Identify required actions based on content
-        required_actions = self._identify_required_actions(subject, body)
+        required_actions = self._identify_required_actions(content)
         
         return {
             "intent": intent.value,  # Email intent as string
@@ -216,7 +241,9 @@ class EmailWorkflow:
         Returns:
             Final processing results dictionary
         """
-        processing_time = (datetime.now() - self.start_time).total_seconds()
+        # One clock read for both the duration and the end timestamp
+        end_time = datetime.now()
+        processing_time = (end_time - self.start_time).total_seconds()
         
         return {
             "success": True,  # Indicate successful processing
@@ -227,108 +254,79 @@ class EmailWorkflow:
                 "state": self.state.value,  # Current workflow state
                 "processing_time": processing_time,  # Total processing time
                 "start_time": self.start_time.isoformat(),  # Workflow start time
-                "end_time": datetime.now().isoformat(),  # Workflow end time
+                "end_time": end_time.isoformat(),  # Workflow end time
                 "config_used": self.config  # Configuration used
             },
             "suggested_actions": self._get_suggested_followup_actions(analysis),  # Suggested next actions
             "confidence_score": analysis.get("confidence", 0.5)  # Overall confidence
         }
     
-    def _determine_intent(self, subject: str, body: str) -> EmailIntent:
+    def _determine_intent(self, content: str) -> EmailIntent:
         """
         Determine email intent using keyword analysis
         
         Args:
-            subject: Email subject line
-            body: Email body content
+            content: Lowercased subject and body
             
         Returns:
             Determined email intent as EmailIntent enum
         """
-        # Combine subject and body for analysis
-        content = (subject + " " + body).lower()
-        
         # Check for scheduling keywords
-        if any(keyword in content for keyword in ["meeting", "schedule", "appointment", "calendar"]):
+        if _SCHEDULING_KW.search(content):
             return EmailIntent.SCHEDULING
         
         # Check for question keywords
-        if any(keyword in content for keyword in ["?", "question", "how", "what", "when", "where"]):
+        if _QUESTION_KW.search(content):
             return EmailIntent.QUESTION
         
         # Check for request keywords
-        if any(keyword in content for keyword in ["please", "request", "need", "require", "would like"]):
+        if _REQUEST_KW.search(content):
             return EmailIntent.REQUEST
         
         # Check for complaint keywords
-        if any(keyword in content for keyword in ["problem", "issue", "complaint", "wrong", "broken"]):
+        if _COMPLAINT_KW.search(content):
             return EmailIntent.COMPLAINT
         
         # Default to unknown if no specific intent detected
         return EmailIntent.UNKNOWN
     
-    def _determine_priority(self, subject: str, body: str) -> EmailPriority:
+    def _determine_priority(self, content: str) -> EmailPriority:
         """
         Determine email priority using keyword analysis
         
         Args:
-            subject: Email subject line
-            body: Email body content
+            content: Lowercased subject and body
             
         Returns:
             Determined email priority as EmailPriority enum
         """
-        # Combine subject and body for analysis
-        content = (subject + " " + body).lower()
-        
         # Check for urgent keywords
-        if any(keyword in content for keyword in ["urgent", "asap", "immediately", "emergency"]):
+        if _URGENT_KW.search(content):
             return EmailPriority.URGENT
         
         # Check for high priority keywords
-        if any(keyword in content for keyword in ["important", "priority", "high", "critical"]):
+        if _HIGH_PRIORITY_KW.search(content):
             return EmailPriority.HIGH
         
         # Check for low priority keywords
-        if any(keyword in content for keyword in ["fyi", "info", "low priority", "when convenient"]):
+        if _LOW_PRIORITY_KW.search(content):
             return EmailPriority.LOW
         
         # Default to normal priority
         return EmailPriority.NORMAL
     
-    def _identify_required_actions(self, subject: str, body: str) -> List[str]:
+    def _identify_required_actions(self, content: str) -> List[str]:
         """
         Identify required actions based on email content
         
         Args:
-            subject: Email subject line
-            body: Email body content
+            content: Lowercased subject and body
             
         Returns:
             List of required actions as strings
         """
-        # Combine subject and body for analysis
-        content = (subject + " " + body).lower()
-        actions = []
-        
-        # Check for action keywords and map to required actions
-        action_mapping = {
-            "schedule": "schedule_meeting",
-            "meeting": "schedule_meeting",
-            "send": "send_email",
-            "reply": "send_email",
-            "document": "attach_document",
-            "file": "attach_document",
-            "information": "search_knowledge_base",
-            "help": "search_knowledge_base"
-        }
-        
-        # Find matching actions
-        for keyword, action in action_mapping.items():
-            if keyword in content and action not in actions:
-                actions.append(action)
-        
-        return actions
+        # Map matching action keywords to required actions
+        return [action for action, keywords in _ACTION_KW.items() if keywords.search(content)]
     
     def _get_suggested_followup_actions(self, analysis: Dict[str, Any]) -> List[str]:
         """
@@ -6,19 +6,24 @@ from contextlib import asynccontextmanager
 from loguru import logger
 
 from src.core.config import settings, Environment
-from src.agents.email_agent import EmailAssistantAgent
+from src.agents.email_agent import get_agent, close_shared_llm
 from src.api.routes import email, eval, review
-from src.database.connection import init_db
+from src.database.connection import init_db, close_db
+from src.services.email_sender import close_smtp_connections
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
+    # Startup: build the DB engine, agent, LLM client and graph once per worker
     logger.info("Starting Email Assistant API")
     init_db()
-    app.state.agent = EmailAssistantAgent()
+    app.state.agent = get_agent()
     yield
-    # Shutdown
+    # Shutdown: flush queued draft saves, then release pooled connections
     logger.info("Shutting down Email Assistant API")
+    await app.state.agent.drain_writes()
+    await close_shared_llm()
+    close_db()
+    close_smtp_connections()
 
 app = FastAPI(
     title="Email Assistant AI API",
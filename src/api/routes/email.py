@@ -5,12 +5,24 @@ from typing import List, Optional, Dict, Any
 import json
 import asyncio
 
-from src.agents.email_agent import EmailAssistantAgent
+try:
+    import orjson
+except ImportError:  # orjson ships with langgraph; fall back to stdlib json otherwise
+    orjson = None
+
+from src.agents.email_agent import EmailAssistantAgent, get_agent
 from src.services.email_sender import send_email as send_email_smtp
 
 router = APIRouter()
 
 
+def _sse(event: Dict[str, Any]) -> bytes:
+    """Encode one server-sent event; called per streamed token, so orjson when available."""
+    if orjson is not None:
+        return b"data: " + orjson.dumps(event, default=str) + b"\n\n"
+    return f"data: {json.dumps(event, default=str)}\n\n".encode()
+
+
 class EmailRequest(BaseModel):
     subject: str
     body: str
@@ -37,7 +49,7 @@ class EmailResponse(BaseModel):
 async def process_email(
     request: EmailRequest,
     background_tasks: BackgroundTasks,
-    agent: EmailAssistantAgent = Depends(lambda: EmailAssistantAgent())
+    agent: EmailAssistantAgent = Depends(get_agent)
 ) -> EmailResponse:
     """Process an incoming email and generate response/actions"""
     try:
@@ -59,21 +71,40 @@ async def process_email(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/process/stream")
+async def process_email_stream(
+    request: EmailRequest,
+    agent: EmailAssistantAgent = Depends(get_agent)
+):
+    """Process an email, streaming node progress and draft tokens as server-sent events"""
+    async def event_generator():
+        try:
+            async for event in agent.process_email_stream(request.model_dump()):
+                yield _sse(event)
+        except Exception as e:
+            yield _sse({"type": "error", "detail": str(e)})
+        yield b"data: DONE\n\n"
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream"
+    )
+
 @router.post("/draft")
 async def draft_email(
     request: EmailRequest,
-    agent: EmailAssistantAgent = Depends(lambda: EmailAssistantAgent())
+    agent: EmailAssistantAgent = Depends(get_agent)
 ) -> Dict[str, Any]:
     """Draft an email response"""
     try:
-        # Use the agent to draft response
-        result = await agent.process_email(request.model_dump())
+        # Draft only: skip the action nodes (no meeting gets scheduled for a draft)
+        result = await agent.process_email(request.model_dump(), fast=True)
         
         analysis = result.get("analysis")
         if isinstance(analysis, str):
             tone_analysis = analysis
         elif isinstance(analysis, dict):
-            tone_analysis = analysis.get("content", "professional")
+            tone_analysis = analysis.get("response_type") or analysis.get("content", "professional")
         else:
             tone_analysis = "professional"
         
@@ -156,7 +187,7 @@ async def get_unread_emails(
 @router.get("/stream")
 async def stream_response(
     email_id: str,
-    agent: EmailAssistantAgent = Depends(lambda: EmailAssistantAgent())
+    agent: EmailAssistantAgent = Depends(get_agent)
 ):
     """Stream the email processing response"""
     async def event_generator():
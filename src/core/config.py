@@ -58,6 +58,9 @@ class Settings(BaseSettings):
     
     # Vector Store
     chroma_persist_path: str = "./chroma_db"
+
+    # Internal knowledge base: .txt/.md files searched with a BM25 index
+    KNOWLEDGE_BASE_PATH: Optional[str] = "./knowledge_base"
     
     # Security
     secret_key: str = "your-secret-key-here"
@@ -74,4 +77,36 @@ class Settings(BaseSettings):
     # Human-in-the-Loop
     HITL_AUTO_APPROVE_RISK: str = "low"  # risk levels at/below this skip review
 
+    # Duplicate response cache: exact repeats (case/whitespace aside) per sender.
+    # Fuzzy matching also answers near-copies, including ones that differ only
+    # in a date, amount or ID, so it is off unless explicitly enabled.
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_FUZZY: bool = False
+    RESPONSE_CACHE_THRESHOLD: float = 0.93  # cosine similarity needed for a fuzzy hit
+    RESPONSE_CACHE_SIZE: int = 512
+
+    # Search result cache (knowledge base / web) for retries and repeats
+    CONTEXT_CACHE_ENABLED: bool = True
+    CONTEXT_CACHE_SIZE: int = 1024
+    CONTEXT_CACHE_TTL: int = 300  # seconds; knowledge-base results
+    WEB_SEARCH_CACHE_TTL: int = 3600  # seconds; web results change slowly
+
+    # Unread-mail summaries keyed by (account, folder, UIDVALIDITY, UID);
+    # stored on disk when diskcache is installed, otherwise in memory.
+    # Summaries hold mail content (sender, subject and a body preview), so with
+    # diskcache that content is written under IMAP_CACHE_PATH: keep it on a
+    # protected volume, or disable the cache where that is not acceptable.
+    IMAP_CACHE_ENABLED: bool = True
+    IMAP_CACHE_PATH: str = "./data/imap_cache"
+    IMAP_CACHE_SIZE: int = 4096  # entries, in-memory cache
+    IMAP_CACHE_DISK_LIMIT: int = 64 * 1024 * 1024  # bytes, on-disk cache
+    IMAP_CACHE_TTL: int = 7 * 24 * 3600  # seconds before a summary is dropped
+    # Concurrent IMAP connections the provider allows per account (Gmail: 15),
+    # split evenly between the API worker processes
+    IMAP_MAX_CONNECTIONS: int = 15
+
+    # Checkpoint graph runs in memory so a retried email (same id and same
+    # content) resumes from its last completed node
+    GRAPH_CHECKPOINT_ENABLED: bool = False
+
 settings = Settings()
@@ -60,7 +60,7 @@ class ProductionSettings(BaseSettings):
     # API Configuration
     API_HOST: str = Field(default="0.0.0.0", description="API server host")
     API_PORT: int = Field(default=8000, description="API server port")
-    API_WORKERS: int = Field(default=4, description="Number of API worker processes")
+    API_WORKERS: Optional[int] = Field(default=None, description="Number of API worker processes (default: 2 * CPUs + 1, max 8)")
     API_RELOAD: bool = Field(default=True, description="Enable auto-reload for development")
     
     # Security Configuration
@@ -243,6 +243,15 @@ def get_logging_config() -> Dict[str, Any]:
         "backup_count": 5
     }
 
+# Settings that must be non-empty for a production start
+REQUIRED_PRODUCTION_VARS = (
+    "SMTP_USERNAME",
+    "SMTP_PASSWORD",
+    "IMAP_USERNAME",
+    "IMAP_PASSWORD",
+    "SECRET_KEY",
+)
+
 def validate_production_environment() -> bool:
     """
     Validate that all required production environment variables are set
@@ -253,13 +262,7 @@ def validate_production_environment() -> bool:
     settings = get_production_settings()
     
     # Check required environment variables
-    required_vars = {
-        "SMTP_USERNAME": settings.SMTP_USERNAME,
-        "SMTP_PASSWORD": settings.SMTP_PASSWORD,
-        "IMAP_USERNAME": settings.IMAP_USERNAME,
-        "IMAP_PASSWORD": settings.IMAP_PASSWORD,
-        "SECRET_KEY": settings.SECRET_KEY
-    }
+    required_vars = {var: getattr(settings, var) for var in REQUIRED_PRODUCTION_VARS}
     
     missing_vars = [var for var, value in required_vars.items() if not value]
     
@@ -1,11 +1,13 @@
+from functools import lru_cache
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from src.core.config import settings
 from src.database.models import Base
 import os
 
+@lru_cache(maxsize=1)
 def init_db():
-    """Initialize database connection"""
+    """Initialize database connection (engine and tables are created once per process)"""
     # Ensure the directory exists for SQLite
     db_path = settings.database_url.replace("sqlite:///", "")
     db_dir = os.path.dirname(db_path)
@@ -16,12 +18,21 @@ def init_db():
     Base.metadata.create_all(bind=engine)
     return engine
 
+@lru_cache(maxsize=1)
+def _session_factory():
+    return sessionmaker(autocommit=False, autoflush=False, bind=init_db())
+
 def get_db():
     """Get database session"""
-    engine = init_db()
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    db = SessionLocal()
+    db = _session_factory()()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def close_db():
+    """Dispose of the pooled engine, if one was created"""
+    if init_db.cache_info().currsize:
+        init_db().dispose()
+    _session_factory.cache_clear()
+    init_db.cache_clear()
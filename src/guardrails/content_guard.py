@@ -85,6 +85,24 @@ _SENSITIVE_TOPICS: dict[str, List[str]] = {
 }
 
 
+def _alternation(keywords: List[str]) -> str:
+    # Longest first so overlapping keywords match the longer phrase
+    return "|".join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True))
+
+
+# One compiled pattern per category (substring match on lowercased text), and
+# one word-bounded pattern over every keyword for redaction: a single regex
+# pass instead of a scan per keyword.
+_SENSITIVE_TOPIC_PATTERNS: dict[str, "re.Pattern[str]"] = {
+    category: re.compile(_alternation(keywords))
+    for category, keywords in _SENSITIVE_TOPICS.items()
+}
+_SENSITIVE_REDACT_PATTERN = re.compile(
+    r"\b(?:" + _alternation([kw for kws in _SENSITIVE_TOPICS.values() for kw in kws]) + r")\b",
+    re.IGNORECASE,
+)
+
+
 class ContentGuard:
     """
     Runs all guardrail checks on an email draft.
@@ -229,12 +247,8 @@ class ContentGuard:
         passport_pattern = _PII_PATTERNS["passport"]
         redacted = passport_pattern.sub("[PASSPORT REDACTED]", redacted)
 
-        # Redact sensitive topics (mask keywords)
-        for category, keywords in _SENSITIVE_TOPICS.items():
-            for keyword in keywords:
-                # Use word boundaries to avoid partial matches
-                pattern = re.compile(r'\b' + re.escape(keyword) + r'\b', re.IGNORECASE)
-                redacted = pattern.sub("[REDACTED]", redacted)
+        # Redact sensitive topics (mask keywords, word-bounded to avoid partial matches)
+        redacted = _SENSITIVE_REDACT_PATTERN.sub("[REDACTED]", redacted)
 
         return redacted
 
@@ -263,11 +277,11 @@ class ContentGuard:
 
     def _check_sensitive_topics(self, draft: str) -> List[str]:
         lower = draft.lower()
-        found = []
-        for category, keywords in _SENSITIVE_TOPICS.items():
-            if any(kw in lower for kw in keywords):
-                found.append(category)
-        return found
+        return [
+            category
+            for category, pattern in _SENSITIVE_TOPIC_PATTERNS.items()
+            if pattern.search(lower)
+        ]
 
     # ------------------------------------------------------------------
     # Helpers
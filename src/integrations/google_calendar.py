@@ -131,35 +131,43 @@ class GoogleCalendarIntegration:
             events_result = self.service.freebusy().query(body=body).execute()
             busy_times = events_result.get('calendars', {}).get(calendar_id, {}).get('busy', [])
             
+            # Parse the busy intervals once and merge overlaps, so the slot
+            # sweep below only ever looks at the next busy block
+            busy_blocks = []
+            for busy in sorted(
+                (
+                    datetime.fromisoformat(busy['start'].replace('Z', '+00:00')).astimezone(tz),
+                    datetime.fromisoformat(busy['end'].replace('Z', '+00:00')).astimezone(tz),
+                )
+                for busy in busy_times
+            ):
+                if busy_blocks and busy[0] <= busy_blocks[-1][1]:
+                    busy_blocks[-1] = (busy_blocks[-1][0], max(busy_blocks[-1][1], busy[1]))
+                else:
+                    busy_blocks.append(busy)
+            
             # Generate available time slots
             available_slots = []
             current_time = start_datetime
             duration_delta = timedelta(minutes=duration)
+            slot_date = target_date.strftime("%Y-%m-%d")
+            next_busy = 0
             
             while current_time + duration_delta <= end_datetime:
                 slot_end = current_time + duration_delta
                 
-                # Check if slot conflicts with any busy time
-                is_available = True
-                for busy in busy_times:
-                    busy_start = datetime.fromisoformat(busy['start'].replace('Z', '+00:00'))
-                    busy_end = datetime.fromisoformat(busy['end'].replace('Z', '+00:00'))
-                    
-                    # Convert to same timezone for comparison
-                    busy_start = busy_start.astimezone(tz)
-                    busy_end = busy_end.astimezone(tz)
-                    
-                    # Check for overlap
-                    if not (slot_end <= busy_start or current_time >= busy_end):
-                        is_available = False
-                        break
+                # Skip busy blocks that end before this slot starts; slots only
+                # move forward, so they can't conflict with later slots either
+                while next_busy < len(busy_blocks) and busy_blocks[next_busy][1] <= current_time:
+                    next_busy += 1
+                is_available = next_busy == len(busy_blocks) or busy_blocks[next_busy][0] >= slot_end
                 
                 if is_available:
                     available_slots.append({
                         "start": current_time.strftime("%H:%M"),
                         "end": slot_end.strftime("%H:%M"),
                         "available": True,
-                        "date": target_date.strftime("%Y-%m-%d"),
+                        "date": slot_date,
                         "timezone": self.timezone
                     })
                 
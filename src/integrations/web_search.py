@@ -9,12 +9,32 @@ import os
 import json
 import logging
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Dict, Any, Optional
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # orjson ships with langgraph; fall back to stdlib json otherwise
+    orjson = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Searches run at once by search_many; matches the session's per-host
+# connection pool so no request waits for a free socket.
+_MAX_CONCURRENT_SEARCHES = 16
+
+
+def _parse_json(response: requests.Response) -> Any:
+    """Decode a JSON API response, straight from the body bytes with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
 class SearchEngine(Enum):
     """Available search engines"""
     SERPER = "serper"
@@ -38,6 +58,17 @@ class WebSearchIntegration:
         # Default search engine
         self.default_engine = SearchEngine.SERPER
         
+        # One keep-alive session for every engine, so repeat searches reuse the
+        # TCP/TLS connection instead of paying a handshake per request. Failed
+        # connects (nothing was sent yet) are retried on a fresh connection.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=_MAX_CONCURRENT_SEARCHES,
+            max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2),
+        )
+        self.session.mount("https://", adapter)
+        
         # Check available engines
         self.available_engines = self._check_available_engines()
         logger.info(f"Available search engines: {[e.value for e in self.available_engines]}")
@@ -111,6 +142,30 @@ class WebSearchIntegration:
             # Try fallback engine
             return self._fallback_search(query, max_results, engine)
     
+    def search_many(
+        self,
+        queries: List[str],
+        max_results: int = 5,
+        engine: Optional[SearchEngine] = None,
+        search_type: str = "general"
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run several searches concurrently over the pooled session
+        
+        The requests are network-bound, so N queries take about as long as
+        the slowest one (up to _MAX_CONCURRENT_SEARCHES at a time).
+        
+        Returns:
+            One result list per query, in query order
+        """
+        if len(queries) <= 1:
+            return [self.search(query, max_results, engine, search_type) for query in queries]
+        workers = min(len(queries), _MAX_CONCURRENT_SEARCHES)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="web-search") as executor:
+            return list(executor.map(
+                lambda query: self.search(query, max_results, engine, search_type), queries
+            ))
+    
     def _select_best_engine(self, search_type: str) -> SearchEngine:
         """Select best engine based on search type"""
         if search_type == "ai_context" and SearchEngine.TAVILY in self.available_engines:
@@ -127,7 +182,7 @@ class WebSearchIntegration:
     def _serper_search(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """Search using Serper API (Google results)"""
         try:
-            response = requests.get(
+            response = self.session.get(
                 "https://api.serper.dev/search",
                 params={
                     "q": query,
@@ -141,7 +196,7 @@ class WebSearchIntegration:
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = _parse_json(response)
                 results = []
                 
                 # Process organic results
@@ -195,14 +250,14 @@ class WebSearchIntegration:
             elif search_type == "academic":
                 payload["include_domains"] = ["scholar.google.com", "arxiv.org", "pubmed.ncbi.nlm.nih.gov"]
             
-            response = requests.post(
+            response = self.session.post(
                 "https://api.tavily.com/search",
                 json=payload,
                 timeout=15
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = _parse_json(response)
                 results = []
                 
                 # Process search results
@@ -239,7 +294,7 @@ class WebSearchIntegration:
     def _google_search(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """Search using Google Custom Search API"""
         try:
-            response = requests.get(
+            response = self.session.get(
                 "https://www.googleapis.com/customsearch/v1",
                 params={
                     "key": self.google_api_key,
@@ -251,7 +306,7 @@ class WebSearchIntegration:
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = _parse_json(response)
                 results = []
                 
                 for item in data.get("items", [])[:max_results]:
@@ -276,7 +331,7 @@ class WebSearchIntegration:
     def _bing_search(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """Search using Bing Search API"""
         try:
-            response = requests.get(
+            response = self.session.get(
                 "https://api.bing.microsoft.com/v7.0/search",
                 params={
                     "q": query,
@@ -290,7 +345,7 @@ class WebSearchIntegration:
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = _parse_json(response)
                 results = []
                 
                 for item in data.get("webPages", {}).get("value", [])[:max_results]:
@@ -1,5 +1,7 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import time
 from typing import Dict, Any, List
@@ -214,12 +216,27 @@ if 'conversation' not in st.session_state:
 if 'email_history' not in st.session_state:
     st.session_state.email_history = []
 
+@st.cache_resource
+def get_api_session() -> requests.Session:
+    """Keep-alive HTTP session to the API, shared across reruns and browser sessions"""
+    session = requests.Session()
+    # Only idempotent GETs are retried; a retried POST could process an email twice
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=20,
+        max_retries=Retry(total=2, backoff_factor=0.1, allowed_methods=frozenset({"GET"})),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 class EmailAssistantUI:
     def __init__(self):
         try:
             self.api_url = st.secrets.get("API_URL", "http://localhost:8000")
         except Exception:
             self.api_url = "http://localhost:8000"
+        self.http = get_api_session()
             
     
     def render_sidebar(self):
@@ -853,7 +870,7 @@ class EmailAssistantUI:
         st.caption("Drafts flagged by the guardrail system that need your approval before sending.")
 
         try:
-            review_resp = requests.get(f"{self.api_url}/api/v1/review/pending", timeout=10)
+            review_resp = self.http.get(f"{self.api_url}/api/v1/review/pending", timeout=10)
             if review_resp.status_code == 200:
                 pending = review_resp.json()
                 if not pending:
@@ -875,7 +892,7 @@ class EmailAssistantUI:
                                     st.markdown(f"- {v}")
 
                             # Fetch full details for the draft text
-                            det_resp = requests.get(f"{self.api_url}/api/v1/review/{rid}", timeout=10)
+                            det_resp = self.http.get(f"{self.api_url}/api/v1/review/{rid}", timeout=10)
                             if det_resp.status_code == 200:
                                 detail = det_resp.json()
                                 st.markdown("**Generated Draft:**")
@@ -892,12 +909,12 @@ class EmailAssistantUI:
                                     edited_val = st.session_state.get(f"edit_{rid}", "")
                                     original = det_resp.json().get('original_draft', '') if det_resp.status_code == 200 else ""
                                     if edited_val.strip() and edited_val.strip() != original.strip():
-                                        r = requests.post(
+                                        r = self.http.post(
                                             f"{self.api_url}/api/v1/review/{rid}/edit",
                                             json={"edited_draft": edited_val}, timeout=10
                                         )
                                     else:
-                                        r = requests.post(f"{self.api_url}/api/v1/review/{rid}/approve", timeout=10)
+                                        r = self.http.post(f"{self.api_url}/api/v1/review/{rid}/approve", timeout=10)
                                     if r.status_code == 200:
                                         st.success("✅ Approved!")
                                         st.rerun()
@@ -907,7 +924,7 @@ class EmailAssistantUI:
                                 reject_reason = st.text_input("Reject reason", key=f"reason_{rid}", placeholder="Optional reason…")
                             with col_c:
                                 if st.button("❌ Reject", key=f"reject_{rid}", use_container_width=True):
-                                    r = requests.post(
+                                    r = self.http.post(
                                         f"{self.api_url}/api/v1/review/{rid}/reject",
                                         json={"reason": st.session_state.get(f"reason_{rid}", "")},
                                         timeout=10
@@ -1032,7 +1049,7 @@ class EmailAssistantUI:
                 "from_email": from_email if from_email else "user@example.com",
                 "to_emails": [e.strip() for e in to_emails.split(",") if e.strip()] if to_emails else ["recipient@example.com"],
             }
-            response = requests.post(
+            response = self.http.post(
                 f"{self.api_url}/api/v1/email/draft",
                 json=payload,
                 timeout=60
@@ -1084,7 +1101,7 @@ class EmailAssistantUI:
                 })
 
         try:
-            response = requests.post(
+            response = self.http.post(
                 f"{self.api_url}/api/v1/email/send",
                 json={
                     "subject": subject,
@@ -1146,7 +1163,7 @@ class EmailAssistantUI:
             }
             
             # Call the real API to get unread emails
-            response = requests.get(
+            response = self.http.get(
                 f"{self.api_url}/api/v1/email/emails/unread",
                 params=params,
                 timeout=30
@@ -1175,7 +1192,7 @@ class EmailAssistantUI:
     def generate_auto_response(self, email: Dict[str, Any]) -> str:
         """Generate auto-response for email using real API"""
         try:
-            response = requests.post(
+            response = self.http.post(
                 f"{self.api_url}/api/v1/email/process",
                 json={
                     "subject": email["subject"],
@@ -1205,7 +1222,7 @@ class EmailAssistantUI:
         """Send an AI-generated reply to the original sender via the email/send API."""
         reply_subject = subject if subject.lower().startswith("re:") else f"Re: {subject}"
         try:
-            response = requests.post(
+            response = self.http.post(
                 f"{self.api_url}/api/v1/email/send",
                 json={
                     "subject": reply_subject,
@@ -0,0 +1,50 @@
+"""
+Tests for the search result TTL cache.
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.agents import context_cache
+from src.agents.context_cache import TTLCache, cache_key
+
+
+@pytest.fixture
+def cache():
+    return TTLCache(maxsize=2, ttl=60)
+
+
+def test_cache_key_ignores_argument_order():
+    assert cache_key("web_search", {"query": "q", "max_results": 5}) == cache_key(
+        "web_search", {"max_results": 5, "query": "q"}
+    )
+    assert cache_key("web_search", {"query": "q"}) != cache_key("internal_knowledge_search", {"query": "q"})
+
+
+def test_hit_returns_copy(cache):
+    cache.set("k", [{"title": "a"}])
+    cache.get("k").append("mutated")
+    assert cache.get("k") == [{"title": "a"}]
+
+
+def test_entries_expire(cache, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(context_cache.time, "monotonic", lambda: now[0])
+    cache.set("short", "x", ttl=10)
+    cache.set("long", "y", ttl=100)
+    now[0] += 50
+    assert cache.get("short") is None
+    assert cache.get("long") == "y"
+
+
+def test_lru_eviction(cache):
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
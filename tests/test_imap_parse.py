@@ -0,0 +1,174 @@
+"""
+Tests for IMAP FETCH response parsing.
+"""
+
+import imaplib
+import socket
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.agents.imap_parse import (
+    decode_preview,
+    find_item,
+    has_filename,
+    parse_fetch_response,
+    text_section,
+)
+from src.agents.tools import _uid_fetch
+
+HEADERS = b"Subject: Hello\r\nFrom: a@example.com\r\n\r\n"
+
+# Shaped like imaplib's return value: literals split into (prefix, bytes) tuples
+FETCH_DATA = [
+    (
+        b'3 (BODYSTRUCTURE ((("TEXT" "PLAIN" ("CHARSET" "utf-8") NIL NIL "QUOTED-PRINTABLE" 12 1 NIL NIL NIL)'
+        b'("TEXT" "HTML" ("CHARSET" "utf-8") NIL NIL "BASE64" 40 1 NIL NIL NIL) "ALTERNATIVE" ("BOUNDARY" "b1") NIL NIL)'
+        b'("APPLICATION" "PDF" ("NAME" "report.pdf") NIL NIL "BASE64" 90000 NIL ("ATTACHMENT" ("FILENAME" "report.pdf")) NIL)'
+        b' "MIXED" ("BOUNDARY" "b0") NIL NIL) BODY[HEADER.FIELDS (SUBJECT FROM TO DATE)] {40}',
+        HEADERS,
+    ),
+    b')',
+    (b'5 (BODYSTRUCTURE ("TEXT" "HTML" ("CHARSET" "iso-8859-1") NIL NIL "BASE64" 20 1 NIL NIL NIL) '
+     b'BODY[HEADER.FIELDS (SUBJECT FROM TO DATE)] {40}', HEADERS),
+    b')',
+]
+
+
+def test_parse_fetch_response_maps_items_per_message():
+    fetched = parse_fetch_response(FETCH_DATA)
+    assert set(fetched) == {b"3", b"5"}
+    assert find_item(fetched[b"3"], b"BODY[HEADER") == HEADERS
+    assert fetched[b"5"][b"BODYSTRUCTURE"][:2] == [b"TEXT", b"HTML"]
+
+
+def test_text_section_walks_nested_multiparts():
+    fetched = parse_fetch_response(FETCH_DATA)
+    assert text_section(fetched[b"3"][b"BODYSTRUCTURE"]) == ("1.1", b"PLAIN", b"QUOTED-PRINTABLE", "utf-8")
+    assert text_section(fetched[b"5"][b"BODYSTRUCTURE"]) == ("1", b"HTML", b"BASE64", "iso-8859-1")
+
+
+def test_has_filename():
+    fetched = parse_fetch_response(FETCH_DATA)
+    assert has_filename(fetched[b"3"][b"BODYSTRUCTURE"])
+    assert not has_filename(fetched[b"5"][b"BODYSTRUCTURE"])
+
+
+def test_decode_preview_handles_truncated_payloads():
+    # "Hello world!" base64-encoded, cut mid-quantum
+    assert decode_preview(b"SGVsbG8gd29y\r\nbGQh"[:-2], b"BASE64", "utf-8") == "Hello wor"
+    assert decode_preview(b"caf=C3=A9 =", b"QUOTED-PRINTABLE", "utf-8").startswith("café")
+    assert decode_preview(b"plain", b"7BIT", "x-unknown") == "plain"
+
+
+def test_parse_fetch_response_keys_by_uid():
+    data = [(b'1 (UID 4827 BODY[1]<0> {5}', b'hello'), b')', b'2 (UID 4831 FLAGS (\\Seen))']
+    fetched = parse_fetch_response(data, key=b"UID")
+    assert set(fetched) == {b"4827", b"4831"}
+    assert fetched[b"4827"][b"BODY[1]<0>"] == b"hello"
+
+
+def test_text_section_prefers_plain_over_earlier_html():
+    structure = [
+        [b"TEXT", b"HTML", [b"CHARSET", b"utf-8"], None, None, b"BASE64", b"40", b"1"],
+        [b"TEXT", b"PLAIN", [b"CHARSET", b"utf-8"], None, None, b"7BIT", b"12", b"1"],
+        b"ALTERNATIVE",
+    ]
+    assert text_section(structure) == ("2", b"PLAIN", b"7BIT", "utf-8")
+
+
+class _FakeIMAPServer:
+    """Scripted IMAP server on one end of a socketpair.
+
+    UID FETCH commands are only answered once ``pipelined`` of them have
+    arrived, so a client that waits for each reply before sending the next
+    command times out instead of passing. Commands whose UID set is in
+    ``bad`` get a tagged BAD.
+    """
+
+    def __init__(self, sock, pipelined, bad=()):
+        self.sock = sock
+        self.pipelined = pipelined
+        self.bad = set(bad)
+        self.fetches = []
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        reader, writer = self.sock.makefile("rb"), self.sock.makefile("wb")
+        writer.write(b"* OK ready\r\n")
+        writer.flush()
+        pending = []
+        while True:
+            line = reader.readline()
+            if not line:
+                return
+            tag, command = line.rstrip(b"\r\n").split(b" ", 1)
+            if command.startswith(b"UID FETCH"):
+                pending.append((tag, command.split(b" ")[2]))
+                self.fetches.append(command.split(b" ")[2])
+                if len(pending) < self.pipelined:
+                    continue
+                for tag, uid_set in pending:
+                    writer.write(self._fetch_reply(tag, uid_set))
+                pending = []
+            elif command.startswith(b"CAPABILITY"):
+                writer.write(b"* CAPABILITY IMAP4rev1\r\n" + tag + b" OK done\r\n")
+            else:
+                writer.write(tag + b" OK done\r\n")
+            writer.flush()
+
+    def _fetch_reply(self, tag, uid_set):
+        if uid_set in self.bad:
+            return tag + b" BAD rejected\r\n"
+        reply = b""
+        for seq, uid in enumerate(_expand(uid_set), 1):
+            body = b"preview %d" % uid
+            reply += b"* %d FETCH (UID %d BODY[1]<0> {%d}\r\n%s)\r\n" % (seq, uid, len(body), body)
+        return reply + tag + b" OK done\r\n"
+
+
+def _expand(uid_set):
+    for run in uid_set.split(b","):
+        first, _, last = run.partition(b":")
+        yield from range(int(first), int(last or first) + 1)
+
+
+def _fake_imap(pipelined, bad=()):
+    client_sock, server_sock = socket.socketpair()
+    client_sock.settimeout(5)
+    server = _FakeIMAPServer(server_sock, pipelined, bad)
+
+    class Client(imaplib.IMAP4):
+        def open(self, host="", port=0, timeout=None):
+            self.sock = client_sock
+            self.file = client_sock.makefile("rb")
+
+    client = Client()
+    client.state = "SELECTED"
+    return client, server
+
+
+def test_uid_fetch_pipelines_batches():
+    uids = [str(uid).encode() for uid in range(1, 251)]
+    imap, server = _fake_imap(pipelined=3)
+
+    status, fetched = _uid_fetch(imap, [(uids, "(BODY.PEEK[1]<0.100>)")])
+
+    assert status == "OK"
+    assert server.fetches == [b"1:100", b"101:200", b"201:250"]
+    assert set(fetched) == set(uids)
+    assert fetched[b"250"][b"BODY[1]<0>"] == b"preview 250"
+    assert imap.noop()[0] == "OK"  # replies were all consumed
+
+
+def test_uid_fetch_keeps_other_batches_when_one_is_rejected():
+    uids = [str(uid).encode() for uid in range(1, 251)]
+    imap, server = _fake_imap(pipelined=3, bad={b"101:200"})
+
+    status, fetched = _uid_fetch(imap, [(uids, "(BODY.PEEK[1]<0.100>)")])
+
+    assert status == "BAD"
+    assert set(fetched) == set(uids[:100] + uids[200:])
+    assert imap.noop()[0] == "OK"
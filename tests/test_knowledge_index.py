@@ -0,0 +1,74 @@
+"""
+Tests for the BM25 knowledge-base index.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.agents.knowledge_index import KnowledgeIndex
+
+
+def _write(path, text, mtime=None):
+    path.write_text(text)
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+def test_ranks_by_term_relevance(tmp_path):
+    _write(tmp_path / "refunds.md", "Refund policy: refunds are issued within 14 days of a refund request.")
+    _write(tmp_path / "shipping.txt", "Shipping takes 3-5 business days. Contact us about shipping delays.")
+    _write(tmp_path / "notes.json", "refund refund refund")
+
+    results = KnowledgeIndex(str(tmp_path)).search("How do I request a refund?")
+    assert [r["title"] for r in results] == ["refunds.md"]
+    assert results[0]["snippet"].startswith("Refund policy")
+
+
+def test_reindexes_changed_and_deleted_files(tmp_path):
+    doc = tmp_path / "faq.md"
+    _write(doc, "Office hours are nine to five.", mtime=1_000_000_000)
+    index = KnowledgeIndex(str(tmp_path), refresh_interval=0)
+    assert index.search("office hours")
+
+    _write(doc, "We are closed on public holidays.", mtime=2_000_000_000)
+    assert not index.search("office hours")
+    assert index.search("holidays")
+
+    doc.unlink()
+    assert not index.search("holidays")
+
+
+def test_refresh_is_rate_limited(tmp_path):
+    doc = tmp_path / "faq.md"
+    _write(doc, "Office hours are nine to five.", mtime=1_000_000_000)
+    index = KnowledgeIndex(str(tmp_path), refresh_interval=3600)
+    assert index.search("office hours")
+
+    # Within the interval the directory is not walked again
+    _write(doc, "We are closed on public holidays.", mtime=2_000_000_000)
+    assert index.search("office hours")
+    assert not index.search("holidays")
+
+    index._refreshed_at -= 3600
+    assert index.search("holidays")
+
+
+def test_index_persists_between_instances(tmp_path):
+    _write(tmp_path / "vpn.md", "Connect to the VPN before accessing the wiki.")
+    KnowledgeIndex(str(tmp_path)).search("vpn")
+    assert (tmp_path / ".index.json").exists()
+
+    reloaded = KnowledgeIndex(str(tmp_path))
+    reloaded._load()
+    assert "vpn.md" in reloaded._docs
+    assert reloaded.search("wiki")[0]["source"] == "vpn.md"
+
+
+def test_corrupt_index_is_ignored(tmp_path):
+    _write(tmp_path / "vpn.md", "Connect to the VPN before accessing the wiki.")
+    (tmp_path / ".index.json").write_text('{"version": 2, "docs": {"vpn.md": [1, 2]}}')
+
+    index = KnowledgeIndex(str(tmp_path))
+    assert index.search("wiki")[0]["source"] == "vpn.md"
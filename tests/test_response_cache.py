@@ -0,0 +1,95 @@
+"""
+Tests for the near-duplicate response cache.
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.agents.response_cache import ResponseCache, cosine, embed
+
+
+def _email(body, subject="Weekly status", sender="alice@example.com"):
+    return {"subject": subject, "body": body, "from_email": sender}
+
+
+@pytest.fixture
+def cache():
+    return ResponseCache(threshold=0.9, max_entries=3)
+
+
+@pytest.fixture
+def fuzzy_cache():
+    return ResponseCache(threshold=0.9, max_entries=3, fuzzy=True)
+
+
+_LONG_BODY = (
+    "Hi team, following up on the vendor review. Legal has signed off on the "
+    "contract and procurement confirmed the budget line, so we are ready to "
+    "move ahead with onboarding. Please bring the integration checklist and "
+    "the open questions from last week so we can close them out. {detail} "
+    "Let me know if anything blocks you before then. Thanks, Alice"
+)
+
+
+def test_embed_is_normalised():
+    vector = embed("Can we meet tomorrow at noon?")
+    assert cosine(vector, vector) == pytest.approx(1.0)
+    assert embed("") == {}
+
+
+def test_exact_repeat_hits(cache):
+    cache.put(_email("Any update on the Q1 design phase?  Thanks"), {"response": "On track."})
+    hit = cache.get(_email("any update on the Q1 design phase?\nThanks"))
+    assert hit == {"response": "On track."}
+
+
+def test_near_duplicate_misses_by_default(cache):
+    cache.put(_email("Any update on the Q1 design phase? Thanks"), {"response": "On track."})
+    assert cache.get(_email("Any update on the Q1 design phase? Thanks!")) is None
+
+
+def test_near_duplicate_hits_when_fuzzy(fuzzy_cache):
+    fuzzy_cache.put(_email("Any update on the Q1 design phase? Thanks"), {"response": "On track."})
+    hit = fuzzy_cache.get(_email("Any update on the Q1 design phase? Thanks!"))
+    assert hit == {"response": "On track."}
+
+
+@pytest.mark.parametrize("old, new", [
+    ("Can we meet Tuesday at 3pm?", "Can we meet Thursday at 10am?"),
+    ("The invoice total is $1,200.", "The invoice total is $1,250."),
+    ("This concerns order INV-1042.", "This concerns order INV-1043."),
+])
+def test_emails_differing_in_dates_amounts_ids_do_not_share_a_reply(cache, old, new):
+    original, changed = _email(_LONG_BODY.format(detail=old)), _email(_LONG_BODY.format(detail=new))
+    # Similar enough that a fuzzy match would have reused the reply
+    assert cosine(embed(cache._text(original)), embed(cache._text(changed))) > 0.93
+    cache.put(original, {"response": old})
+    assert cache.get(changed) is None
+    assert cache.get(original) == {"response": old}
+
+
+def test_different_email_misses(cache):
+    cache.put(_email("Any update on the Q1 design phase?"), {"response": "On track."})
+    assert cache.get(_email("Please send the signed contract by Friday.")) is None
+
+
+def test_not_shared_across_senders(cache):
+    cache.put(_email("Any update on the Q1 design phase?"), {"response": "Hi Alice"})
+    assert cache.get(_email("Any update on the Q1 design phase?", sender="bob@example.com")) is None
+
+
+def test_returns_copies(cache):
+    cache.put(_email("ping"), {"actions_taken": []})
+    cache.get(_email("ping"))["actions_taken"].append("mutated")
+    assert cache.get(_email("ping")) == {"actions_taken": []}
+
+
+def test_lru_eviction(cache):
+    for i in range(4):
+        cache.put(_email(f"message number {i} about topic {i}"), {"response": str(i)})
+    assert len(cache) == 3
+    assert cache.get(_email("message number 0 about topic 0")) is None
+    assert cache.get(_email("message number 3 about topic 3")) == {"response": "3"}
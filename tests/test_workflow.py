@@ -0,0 +1,41 @@
+"""
+Tests for the rule-based keyword analysis in the email workflow.
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.agents.workflow import EmailWorkflow
+
+
+def _analyze(body, subject=""):
+    return asyncio.run(EmailWorkflow()._analyze_email({"subject": subject, "body": body}))
+
+
+# Keywords match as substrings, so inflections and prefixes count too
+@pytest.mark.parametrize("body, intent, priority, actions", [
+    ("I need to reschedule our call.", "scheduling", "normal", ["schedule_meeting"]),
+    ("Sending the documents now, rescheduled for Friday.", "scheduling", "normal",
+     ["schedule_meeting", "send_email", "attach_document"]),
+    ("We needed this yesterday", "request", "normal", []),
+    ("Two requests for you", "request", "normal", []),
+    ("I sent it", "unknown", "normal", []),
+    ("Replying to your note", "unknown", "normal", ["send_email"]),
+    ("Please show me the highlights", "question", "high", []),
+    ("fyi the file is attached", "unknown", "low", ["attach_document"]),
+])
+def test_keyword_analysis(body, intent, priority, actions):
+    analysis = _analyze(body)
+    assert analysis["intent"] == intent
+    assert analysis["priority"] == priority
+    assert analysis["required_actions"] == actions
+
+
+def test_subject_is_searched():
+    analysis = _analyze("See below.", subject="URGENT: calendar invite")
+    assert analysis["intent"] == "scheduling"
+    assert analysis["priority"] == "urgent"